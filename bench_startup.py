@@ -0,0 +1,215 @@
+"""
+Cold-start benchmark: launches main.py repeatedly with -X importtime and
+measures per-module import cost and wall time until the first pulse.
+
+    python bench_startup.py --runs 10 --output bench_startup.json
+    python bench_startup.py --baseline old_report.json
+
+Runs with the fake Win32 and tray backends, so it works headless on Linux
+(wrapped in xvfb-run when there is no X display).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from startup_marker import FIRST_PULSE_MARKER
+
+# Heavy imports we want to keep off (or cheap on) the startup path
+TRACKED_MODULES = {
+    "customtkinter": ("customtkinter",),
+    "PIL": ("PIL",),
+    "pystray": ("pystray",),
+    "win32": ("win32", "pywintypes", "pythoncom"),
+}
+
+# Absolute limits checked on every run (median values)
+DEFAULT_THRESHOLDS = {
+    "first_pulse_ms": 1500.0,
+    "import_ms.customtkinter": 0.0,  # Dialogs are lazy; must not load before the first pulse
+}
+
+# Allowed slowdown against --baseline before a metric counts as a regression
+DEFAULT_MAX_REGRESSION = 0.20
+
+TIMEOUT_S = 30
+
+
+def parse_importtime(stderr_text):
+    """
+    Parses `-X importtime` output into {tracked_name: cumulative_ms}.
+    Nested matches are only counted once (via their outermost import).
+    """
+    entries = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue  # Header line
+        name_field = parts[2]
+        depth = len(name_field) - len(name_field.lstrip(" "))
+        entries.append((depth, name_field.strip(), cumulative_us))
+
+    totals = {name: 0.0 for name in TRACKED_MODULES}
+    # Output is post-order (children before parents); walk it backwards so a
+    # package is seen before its submodules and they can be skipped.
+    for name, prefixes in TRACKED_MODULES.items():
+        covered_depth = None
+        for depth, module, cumulative_us in reversed(entries):
+            if covered_depth is not None and depth > covered_depth:
+                continue
+            covered_depth = None
+            if module.startswith(prefixes):
+                totals[name] += cumulative_us / 1000
+                covered_depth = depth
+    return totals
+
+
+def build_command():
+    cmd = [sys.executable, "-X", "importtime", "main.py",
+           "--fake-win32", "--fake-tray", "--exit-after-first-pulse"]
+    if platform.system() == "Linux" and not os.environ.get("DISPLAY"):
+        xvfb = shutil.which("xvfb-run")
+        if not xvfb:
+            print("❌ No X display and xvfb-run not found; Tk needs a display to start.")
+            sys.exit(2)
+        cmd = [xvfb, "-a"] + cmd
+    return cmd
+
+
+def run_once(cmd):
+    """Returns a dict of metrics for one cold start."""
+    # -X importtime output is large: a pipe nobody reads until the end
+    # would fill up and block the child, so it goes to a file
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as stderr_file:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        # Killing the child closes stdout, which ends the read loop below
+        watchdog = threading.Timer(TIMEOUT_S, proc.kill)
+        watchdog.start()
+        first_pulse_ms = None
+        in_process_ms = None
+        try:
+            # Read to EOF so later output can't block the child either
+            for line in proc.stdout:
+                if first_pulse_ms is None and line.startswith(FIRST_PULSE_MARKER):
+                    first_pulse_ms = (time.perf_counter() - start) * 1000
+                    try:
+                        in_process_ms = float(line.split()[1])
+                    except (IndexError, ValueError):
+                        pass
+            proc.wait()
+        finally:
+            watchdog.cancel()
+            proc.stdout.close()
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+
+    if first_pulse_ms is None:
+        raise RuntimeError(f"App exited without a first pulse (code {proc.returncode}):\n{stderr[-2000:]}")
+
+    metrics = {
+        "first_pulse_ms": first_pulse_ms,
+        "in_process_first_pulse_ms": in_process_ms,
+        "exit_code": proc.returncode,
+    }
+    for name, ms in parse_importtime(stderr).items():
+        metrics[f"import_ms.{name}"] = ms
+    return metrics
+
+
+def summarize(runs):
+    keys = [k for k in runs[0] if isinstance(runs[0][k], (int, float)) and k != "exit_code"]
+    summary = {}
+    for key in keys:
+        values = [r[key] for r in runs if r.get(key) is not None]
+        if not values:
+            continue
+        summary[key] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def check(summary, thresholds, baseline=None, max_regression=DEFAULT_MAX_REGRESSION):
+    """Returns a list of human-readable failures."""
+    failures = []
+    for key, limit in thresholds.items():
+        if key in summary and summary[key]["median"] > limit:
+            failures.append(f"{key}: median {summary[key]['median']:.1f} > threshold {limit:.1f}")
+
+    if baseline:
+        for key, stats in summary.items():
+            base = baseline.get("summary", {}).get(key)
+            if not base or base["median"] <= 0:
+                continue
+            allowed = base["median"] * (1 + max_regression)
+            if stats["median"] > allowed:
+                failures.append(f"{key}: median {stats['median']:.1f} > baseline "
+                                f"{base['median']:.1f} +{max_regression:.0%}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RDP Heartbeat cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default="bench_startup.json")
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION)
+    args = parser.parse_args()
+
+    cmd = build_command()
+    print(f"🚀 Running {args.runs} cold starts: {' '.join(cmd)}")
+
+    runs = []
+    for i in range(args.runs):
+        metrics = run_once(cmd)
+        runs.append(metrics)
+        print(f"  run {i + 1}: first pulse {metrics['first_pulse_ms']:.0f} ms")
+
+    summary = summarize(runs)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    failures = check(summary, DEFAULT_THRESHOLDS, baseline, args.max_regression)
+
+    report = {
+        "platform": platform.platform(),
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "summary": summary,
+        "thresholds": DEFAULT_THRESHOLDS,
+        "failures": failures,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+
+    for key, stats in summary.items():
+        print(f"  {key}: median {stats['median']:.1f} ms (min {stats['min']:.1f}, max {stats['max']:.1f})")
+    print(f"📁 Report written to {os.path.abspath(args.output)}")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Within thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,45 @@
+import argparse
+import json
 import os
+import platform
+import statistics
 import subprocess
 import shutil
 import sys
 import re
+import time
 from version import APP_VERSION
 
+# Kept outside dist/ so results from earlier profile builds survive a clean
+REPORT_PATH = "build_report.json"
+STARTUP_RUNS = 5
+
+# Modules PyInstaller picks up that the app never uses at runtime
+UNUSED_MODULES = [
+    "unittest", "doctest", "pydoc", "pdb", "test", "tkinter.test", "lib2to3",
+    "distutils", "setuptools", "pip",
+    "numpy", "PyQt5", "PySide2", "PySide6", "IPython",
+    "PIL.ImageQt", "PIL.ImageShow",
+]
+
+# Build profiles:
+#   onefile - single RDPHeartbeat.exe (unpacks to a temp dir on every launch)
+#   fast    - onedir layout, nothing to unpack; unused modules excluded,
+#             optimized bytecode, stripped binaries, no UPX
+PROFILES = {
+    "onefile": {
+        "layout": ["--onefile"],
+        "extra": [],
+        "distpath": "dist",
+    },
+    "fast": {
+        "layout": ["--onedir"],
+        "extra": ["--optimize=1", "--strip", "--noupx"]
+                 + [f"--exclude-module={m}" for m in UNUSED_MODULES],
+        "distpath": os.path.join("dist", "fast"),
+    },
+}
+
 def patch_setup_iss():
     """Patch setup.iss with the current version from version.py."""
     iss_path = "setup.iss"
@@ -22,35 +57,100 @@ def patch_setup_iss():
         f.write(content)
     print(f"✅ Patched {iss_path} with version {APP_VERSION}")
 
-def run_build():
-    print(f"🚀 Starting Build Process for RDP Heartbeat v{APP_VERSION}...")
+def exe_path_for(profile):
+    distpath = PROFILES[profile]["distpath"]
+    if profile == "onefile":
+        return os.path.join(distpath, "RDPHeartbeat.exe")
+    return os.path.join(distpath, "RDPHeartbeat", "RDPHeartbeat.exe")
 
-    # 0. Patch setup.iss with current version
-    patch_setup_iss()
+def bundle_size(profile):
+    """Total bytes of the artifact (the exe, or the whole onedir folder)."""
+    exe_path = exe_path_for(profile)
+    if profile == "onefile":
+        return os.path.getsize(exe_path)
+    total = 0
+    for root, _, files in os.walk(os.path.dirname(exe_path)):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
 
-    # 1. Clean previous builds
-    if os.path.exists("build"):
-        shutil.rmtree("build")
-    if os.path.exists("dist"):
-        shutil.rmtree("dist")
+def measure_warm_start(exe_path, runs=STARTUP_RUNS):
+    """
+    Median ms from launch until the app exits after its first pulse.
+    Windowed builds have no stdout, so process exit is the marker.
+    The runs are back to back, after one discarded warm-up launch, so this
+    is a warm-cache figure: the exe and its DLLs are already in the OS file
+    cache. --exit-after-first-pulse skips the single-instance check, so a
+    heartbeat already running on the build machine doesn't affect it.
+    Returns None if any launch fails.
+    """
+    if platform.system() != "Windows":
+        return None
+    cmd = [exe_path, "--fake-tray", "--exit-after-first-pulse"]
+    times = []
+    for i in range(runs + 1):
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(cmd, timeout=60)
+        except subprocess.TimeoutExpired:
+            print(f"❌ Startup run timed out: {' '.join(cmd)}")
+            return None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            print(f"❌ Startup run exited with code {result.returncode}, not recording a time")
+            return None
+        if i > 0:
+            times.append(elapsed_ms)
+    return statistics.median(times)
+
+def write_report(profile, size_bytes, warm_start_ms):
+    report = {}
+    if os.path.exists(REPORT_PATH):
+        try:
+            with open(REPORT_PATH, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except Exception:
+            report = {}
+    report[profile] = {
+        "version": APP_VERSION,
+        "size_bytes": size_bytes,
+        "warm_start_ms": warm_start_ms,
+        "built_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+
+    print("📊 Build report:")
+    for name, entry in sorted(report.items()):
+        warm = entry.get("warm_start_ms")
+        warm_text = f"{warm:.0f} ms" if warm is not None else "n/a"
+        print(f"   {name:8} size {entry['size_bytes'] / 1_048_576:6.1f} MB   warm start {warm_text}")
+
+def run_build(profile="onefile"):
+    print(f"🚀 Starting Build Process for RDP Heartbeat v{APP_VERSION} (profile: {profile})...")
+    settings = PROFILES[profile]
 
     # 2. PyInstaller Command
     # --noconsole: Don't show a terminal window
-    # --onefile: Bundle everything into a single .exe
+    # --onefile / --onedir: Layout, see PROFILES
     # --name: Output filename
     # --clean: Clean PyInstaller cache
     cmd = [
         sys.executable, "-m", "PyInstaller",
         "--noconsole",
-        "--onefile",
+        *settings["layout"],
         "--name=RDPHeartbeat",
         "--clean",
+        f"--distpath={settings['distpath']}",
         # Icon configuration
         "--icon=icon.ico",
         "--add-data=icon.ico;.",
+        # Translation catalogs, read by i18n at runtime
+        "--add-data=locales;locales",
         # Explicitly import hidden imports if needed (sometimes pystray/PIL needs help)
         "--hidden-import=PIL._tkinter_finder",
         "--hidden-import=pystray",
+        *settings["extra"],
         "main.py"
     ]
 
@@ -62,13 +162,25 @@ def run_build():
         sys.exit(1)
 
     # 3. Verify Output
-    exe_path = os.path.join("dist", "RDPHeartbeat.exe")
+    exe_path = exe_path_for(profile)
     if os.path.exists(exe_path):
         print(f"✅ Build Successful!")
         print(f"📁 Executable location: {os.path.abspath(exe_path)}")
         print("You can now run this EXE to test the application.")
     else:
         print("❌ Build finished but EXE was not found.")
+        return
+
+    # 4. Size and startup report
+    print("⏱️ Measuring warm start...")
+    write_report(profile, bundle_size(profile), measure_warm_start(exe_path))
+
+def clean():
+    # 1. Clean previous builds
+    if os.path.exists("build"):
+        shutil.rmtree("build")
+    if os.path.exists("dist"):
+        shutil.rmtree("dist")
 
 if __name__ == "__main__":
     # Check if pyinstaller is installed
@@ -78,4 +190,15 @@ if __name__ == "__main__":
         print("⚠️ PyInstaller is not installed. Installing it now...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
 
-    run_build()
+    parser = argparse.ArgumentParser(description="Build RDP Heartbeat with PyInstaller")
+    parser.add_argument("--profile", choices=list(PROFILES) + ["all"], default="onefile",
+                        help="onefile (default, used by setup.iss) or fast (onedir, startup-optimized)")
+    args = parser.parse_args()
+
+    # 0. Patch setup.iss with current version
+    patch_setup_iss()
+    clean()
+
+    profiles = list(PROFILES) if args.profile == "all" else [args.profile]
+    for profile in profiles:
+        run_build(profile)
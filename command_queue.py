@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import deque, namedtuple
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+NS_PER_MS = 1_000_000
+
+# Command kinds. Tray, control endpoint and other threads only ever enqueue
+# these; their handlers run on the Tk thread.
+SHOW = "show"
+HIDE = "hide"
+TOGGLE_MOVE = "toggle_move"
+OPEN_SETTINGS = "open_settings"
+OPEN_ABOUT = "open_about"
+APPLY_CONTROL = "apply_control"  # payload: parsed control arguments (main.parse_args)
+PROFILE = "profile"  # payload: duration in seconds, or None for the default
+EXIT = "exit"
+
+KINDS = (SHOW, HIDE, TOGGLE_MOVE, OPEN_SETTINGS, OPEN_ABOUT, APPLY_CONTROL, PROFILE, EXIT)
+
+Command = namedtuple("Command", ["kind", "payload", "enqueued_ns"])
+
+
+class CommandQueue:
+    """
+    Bounded, thread-safe queue of Commands from other threads to the Tk
+    loop. put() never blocks: when the queue is full the command is
+    rejected and counted. drain() runs on the Tk thread at a fixed point in
+    each frame and records each command's enqueue-to-execute latency.
+    """
+
+    def __init__(self, capacity=64, clock=time.monotonic_ns):
+        self.capacity = capacity
+        self.clock = clock
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._handlers = {}
+        self.rejected = 0
+        # kind -> [count, total_ns, max_ns]
+        self.latency = {}
+
+    def register(self, kind, handler):
+        """handler(payload) runs on the draining thread."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown command kind: {kind}")
+        self._handlers[kind] = handler
+
+    def put(self, kind, payload=None):
+        """Enqueues a command from any thread. Returns False if the queue is full."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown command kind: {kind}")
+        command = Command(kind, payload, self.clock())
+        with self._lock:
+            if len(self._items) >= self.capacity:
+                self.rejected += 1
+                full = True
+            else:
+                self._items.append(command)
+                full = False
+        if full:
+            logger.warning(f"Command queue full, dropped '{kind}'")
+        return not full
+
+    def __len__(self):
+        return len(self._items)
+
+    def drain(self, max_batch=16):
+        """Runs up to max_batch queued commands. Returns how many ran."""
+        if not self._items:
+            return 0  # Common case: one unlocked length check per frame
+        with self._lock:
+            batch = [self._items.popleft() for _ in range(min(max_batch, len(self._items)))]
+        for command in batch:
+            latency_ns = self.clock() - command.enqueued_ns
+            stats = self.latency.get(command.kind)
+            if stats is None:
+                self.latency[command.kind] = [1, latency_ns, latency_ns]
+            else:
+                stats[0] += 1
+                stats[1] += latency_ns
+                if latency_ns > stats[2]:
+                    stats[2] = latency_ns
+            handler = self._handlers.get(command.kind)
+            if handler is None:
+                logger.warning(f"No handler for command '{command.kind}'")
+                continue
+            try:
+                handler(command.payload)
+            except Exception as e:
+                logger.error(f"Error running command '{command.kind}': {e}")
+        return len(batch)
+
+    def format_summary(self):
+        """One line: per-kind count, mean and max latency in ms; "" if nothing ran."""
+        parts = [f"{kind} {count}x avg {total / count / NS_PER_MS:.0f} max {worst / NS_PER_MS:.0f} ms"
+                 for kind, (count, total, worst) in sorted(self.latency.items())]
+        if self.rejected:
+            parts.append(f"rejected {self.rejected}")
+        return ", ".join(parts)
@@ -1,27 +1,291 @@
 import json
+import math
 import os
 import platform
+import threading
+from contextlib import contextmanager
 from logger import get_logger
+from waveform import CURVES
 
 logger = get_logger(__name__)
 
+DEFAULT_CONFIG = {
+    "dot_color": "#00FFFF",  # Cyan
+    "dot_size": 16,
+    "opacity_max": 1.0,
+    "opacity_min": 0.3,
+    "pulse_speed_ms": 50,
+    "pulse_curve": "sine",  # sine, ease_in_out or triangle
+    "renderer": "color_key",  # color_key or per_pixel_alpha (antialiased, needs restart)
+    "high_res_timer": False,  # Request 1 ms Windows timer resolution while pulsing
+    # Recolor the dot when the heartbeat's own event loop is late, so a
+    # local stall isn't mistaken for an RDP stall
+    "lag_indicator": True,
+    "lag_warn_ms": 150,
+    "lag_critical_ms": 500,
+    "lag_warn_color": "#FFB000",
+    "lag_critical_color": "#FF3030",
+    # Tray icon shows healthy / lagging / stalled, refreshed at this rate
+    "tray_status_icon": False,
+    "tray_status_interval_ms": 1000,
+    "always_on_top": True,
+    "window_x": None,
+    "window_y": None,
+    # Monitor the dot was placed on, and its offset from that monitor's
+    # work area; restored in preference to window_x/window_y
+    "window_monitor": None,
+    "window_rel_x": None,
+    "window_rel_y": None,
+    # Extra dots, e.g. [{"monitor": "\\\\.\\DISPLAY2"}, {"anchor": "top_center",
+    # "offset_x": 220, "offset_y": 0, "color": "#FF00FF", "size": 10}]
+    "indicators": (),
+    "indicator_on_every_monitor": False,
+    "language": "auto",
+    "auto_start": False
+}
+
+
+# ── Validation ──
+# Each validator returns the normalized value, or `default` if it can't be used.
+
+def _bool(value, default):
+    return value if isinstance(value, bool) else default
+
+
+# json.load accepts NaN and Infinity: int() of those raises ValueError /
+# OverflowError, and NaN would slip through min()/max() clamping.
+
+def _int_range(lo, hi):
+    def validate(value, default):
+        if isinstance(value, bool):
+            return default
+        try:
+            return max(lo, min(hi, int(value)))
+        except (TypeError, ValueError, OverflowError):
+            return default
+    return validate
+
+
+def _float_range(lo, hi):
+    def validate(value, default):
+        if isinstance(value, bool):
+            return default
+        try:
+            value = float(value)
+        except (TypeError, ValueError, OverflowError):
+            return default
+        if not math.isfinite(value):
+            return default
+        return max(lo, min(hi, value))
+    return validate
+
+
+def _optional_int(value, default):
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return default
+
+
+def _optional_str(value, default):
+    return value if value is None or isinstance(value, str) else default
+
+
+def _str(value, default):
+    return value if isinstance(value, str) else default
+
+
+def _choice(*options):
+    def validate(value, default):
+        return value if value in options else default
+    return validate
+
+
+def _color(value, default):
+    """Normalizes "#rgb" / "#rrggbb" (with or without '#') to "#RRGGBB"."""
+    if not isinstance(value, str):
+        return default
+    digits = value.strip().lstrip("#")
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    if len(digits) != 6:
+        return default
+    try:
+        int(digits, 16)
+    except ValueError:
+        return default
+    return "#" + digits.upper()
+
+
+# Where an extra indicator sits within its monitor's work area (indicator.py)
+ANCHORS = ("bottom_right", "bottom_left", "top_right", "top_left", "top_center")
+
+INDICATOR_FIELDS = {
+    "monitor": _optional_str,
+    "anchor": _choice(*ANCHORS),
+    "offset_x": _int_range(-10_000, 10_000),
+    "offset_y": _int_range(-10_000, 10_000),
+    "color": _color,
+    "size": _int_range(4, 256),
+}
+
+
+def _indicator_list(value, default):
+    """
+    Indicator specs. A key with an invalid value is dropped, so that dot
+    falls back as if it were unset (main dot's color/size, primary monitor,
+    bottom_right); unknown keys are kept.
+    """
+    if not isinstance(value, (list, tuple)):
+        return default
+    specs = []
+    for item in value:
+        if not isinstance(item, dict):
+            continue
+        spec = {}
+        for key, raw in item.items():
+            validate = INDICATOR_FIELDS.get(key)
+            if validate is None:
+                spec[key] = raw
+                continue
+            checked = validate(raw, None)
+            if checked is None:
+                if raw is not None:
+                    logger.warning(f"Ignoring indicator {key}={raw!r}")
+                continue
+            spec[key] = checked
+        specs.append(spec)
+    return tuple(specs)
+
+
+FIELDS = {
+    "dot_color": _color,
+    "dot_size": _int_range(4, 256),
+    "opacity_max": _float_range(0.0, 1.0),
+    "opacity_min": _float_range(0.0, 1.0),
+    "pulse_speed_ms": _int_range(10, 1000),
+    "pulse_curve": _choice(*CURVES),
+    "renderer": _choice("color_key", "per_pixel_alpha"),
+    "high_res_timer": _bool,
+    "lag_indicator": _bool,
+    "lag_warn_ms": _int_range(1, 60_000),
+    "lag_critical_ms": _int_range(1, 60_000),
+    "lag_warn_color": _color,
+    "lag_critical_color": _color,
+    "tray_status_icon": _bool,
+    "tray_status_interval_ms": _int_range(100, 60_000),
+    "always_on_top": _bool,
+    "window_x": _optional_int,
+    "window_y": _optional_int,
+    "window_monitor": _optional_str,
+    "window_rel_x": _optional_int,
+    "window_rel_y": _optional_int,
+    "indicators": _indicator_list,
+    "indicator_on_every_monitor": _bool,
+    "language": _str,
+    "auto_start": _bool,
+}
+
+# (low, high) fields that must satisfy low <= high
+ORDERED_PAIRS = (
+    ("opacity_min", "opacity_max"),
+    ("lag_warn_ms", "lag_critical_ms"),
+)
+
+
+class ConfigSnapshot:
+    """
+    Frozen, validated view of the whole config. Fields are plain attributes
+    (cfg.snapshot.dot_size). Changes build a new snapshot with replace(),
+    which the ConfigManager publishes by swapping one reference, so readers
+    on any thread see either the old or the new config, never a mix.
+    Unknown keys from config.json are kept in `extras` and saved back.
+    """
+
+    __slots__ = tuple(FIELDS) + ("extras",)
+
+    def __init__(self, values=None, base=None):
+        values = values or {}
+        for key, validate in FIELDS.items():
+            fallback = getattr(base, key) if base is not None else DEFAULT_CONFIG[key]
+            value = validate(values[key], fallback) if key in values else fallback
+            object.__setattr__(self, key, value)
+        for low, high in ORDERED_PAIRS:
+            low_value, high_value = getattr(self, low), getattr(self, high)
+            if low_value <= high_value:
+                continue
+            if low in values and high in values:
+                # Both given, inverted: keep the previous (or default) pair
+                logger.warning(f"Ignoring {low}={low_value} > {high}={high_value}")
+                low_value = getattr(base, low) if base is not None else DEFAULT_CONFIG[low]
+                high_value = getattr(base, high) if base is not None else DEFAULT_CONFIG[high]
+            elif low in values:
+                high_value = low_value  # The edited bound moves the other one along
+            else:
+                low_value = high_value
+            object.__setattr__(self, low, low_value)
+            object.__setattr__(self, high, high_value)
+        extras = dict(base.extras) if base is not None else {}
+        extras.update((k, v) for k, v in values.items() if k not in FIELDS)
+        object.__setattr__(self, "extras", extras)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("ConfigSnapshot is immutable; use replace()")
+
+    def replace(self, values):
+        """New snapshot with `values` validated and applied over this one."""
+        return ConfigSnapshot(values, base=self)
+
+    def get(self, key, default=None):
+        if key in FIELDS:
+            return getattr(self, key)
+        return self.extras.get(key, default)
+
+    def diff(self, other, keys):
+        """{key: value in self} for fields that differ from `other`, plus any of `keys`."""
+        return {k: self.get(k) for k in set(FIELDS).union(keys) if self.get(k) != other.get(k)}
+
+    def to_dict(self):
+        data = dict(self.extras)
+        for key in FIELDS:
+            value = getattr(self, key)
+            data[key] = list(value) if isinstance(value, tuple) else value
+        return data
+
+
 class ConfigManager:
-    DEFAULT_CONFIG = {
-        "dot_color": "#00FFFF",  # Cyan
-        "dot_size": 16,
-        "opacity_max": 1.0,
-        "opacity_min": 0.3,
-        "pulse_speed_ms": 50,
-        "always_on_top": True,
-        "window_x": None,
-        "window_y": None,
-        "language": "auto",
-        "auto_start": False
-    }
+    DEFAULT_CONFIG = DEFAULT_CONFIG
+
+    # Bursts of set() calls within this window are merged into one disk write
+    SAVE_DELAY_S = 0.5
 
     def __init__(self, filename="config.json"):
         self.filename = filename
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Current config. Replaced, never mutated: read it (or its
+        # attributes) from any thread without locking.
+        self.snapshot = ConfigSnapshot()
+        self._subscribers = []
+        self._dispatcher = None
+
+        # Transactions and debounced writes
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._batch_owner = None
+        self._working = None  # Unpublished snapshot while a batch is open
+        self._failed = False  # An exception escaped the open batch; discard it
+        self._pending = {}
+        self._save_timer = None
+        self._dirty = False
+        # Held from taking the snapshot to the rename: the debounce timer's
+        # flush() and the exit-time flush() share config.json.tmp
+        self._write_lock = threading.Lock()
+        self.write_count = 0  # Number of times config.json was actually written
+
+        # (mtime_ns, size) of config.json as last read or written by us
+        self._file_signature = None
+
         self.load()
 
     def get_config_dir(self):
@@ -44,33 +308,226 @@ class ConfigManager:
             if os.path.exists(path):
                 with open(path, 'r') as f:
                     user_config = json.load(f)
-                    # Update defaults with user config (preserves new keys in defaults)
-                    self.config.update(user_config)
+                # Validated over the defaults (preserves new keys in defaults)
+                self.snapshot = ConfigSnapshot(user_config)
+                self._file_signature = self._stat_signature(path)
             else:
                 self.save() # Create default config file
         except Exception as e:
             logger.error(f"Error loading config: {e}")
 
     def save(self):
-        """Saves current config to file."""
-        config_dir = self.get_config_dir()
-        if not os.path.exists(config_dir):
+        """
+        Saves current config to file immediately.
+        Writes to a temp file, fsyncs it and renames it into place so a crash
+        mid-write never leaves a truncated config.json behind. Concurrent
+        saves run one at a time, so the newest snapshot is always the one
+        that lands.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._save_timer:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                self._dirty = False
+                data = json.dumps(self.snapshot.to_dict(), indent=4)
+
+            config_dir = self.get_config_dir()
+            if not os.path.exists(config_dir):
+                try:
+                    os.makedirs(config_dir)
+                except OSError as e:
+                    logger.error(f"Error creating config directory: {e}")
+                    return
+
+            path = self.get_config_path()
+            tmp_path = path + ".tmp"
             try:
-                os.makedirs(config_dir)
-            except OSError as e:
-                logger.error(f"Error creating config directory: {e}")
+                with open(tmp_path, 'w') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+                self.write_count += 1
+                self._file_signature = self._stat_signature(path)
+            except Exception as e:
+                logger.error(f"Error saving config: {e}")
+
+    def schedule_save(self):
+        """Marks config dirty and writes it once after SAVE_DELAY_S (debounced)."""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY_S, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """Writes any pending changes now. Call before exiting."""
+        with self._lock:
+            if not self._dirty:
                 return
+        self.save()
+
+    # ── External edits ──
+
+    @staticmethod
+    def _stat_signature(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
 
+    def check_for_external_changes(self):
+        """
+        Cheap hot-reload check, meant to be called every few seconds.
+        Only stats the file; it is re-parsed when mtime or size differ from
+        what we last read or wrote. Changed keys are merged into the live
+        config and delivered to subscribers. Returns the changed keys.
+        """
         path = self.get_config_path()
+        signature = self._stat_signature(path)
+        if signature is None or signature == self._file_signature:
+            return {}
+
         try:
-            with open(path, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            with open(path, 'r') as f:
+                user_config = json.load(f)
         except Exception as e:
-            logger.error(f"Error saving config: {e}")
+            # Possibly caught mid-write by the external tool, retry next check
+            logger.warning(f"Error reloading config: {e}")
+            return {}
+        self._file_signature = signature
+
+        if not isinstance(user_config, dict):
+            logger.warning("Ignoring config.json: top level is not an object")
+            return {}
+
+        with self._lock:
+            old = self.snapshot
+            try:
+                new = old.replace(user_config)
+            except Exception as e:
+                logger.error(f"Error applying reloaded config: {e}")
+                return {}
+            # Not just the keys in the file: ordering rules may move others
+            changed = new.diff(old, user_config)
+            if changed:
+                self.snapshot = new
+
+        if changed:
+            logger.info(f"Config reloaded from disk, changed keys: {sorted(changed)}")
+            self._notify(changed)
+        return changed
+
+    @property
+    def config(self):
+        """Plain-dict copy of the current config."""
+        return self.snapshot.to_dict()
 
     def get(self, key):
-        return self.config.get(key, self.DEFAULT_CONFIG.get(key))
+        """
+        Value of `key` from the published snapshot (or, on the thread inside
+        a batch, its pending changes). Hot paths read cfg.snapshot.<key>.
+        """
+        snapshot = self.snapshot
+        if self._batch_owner is not None and self._batch_owner == threading.get_ident():
+            snapshot = self._working
+        return snapshot.get(key, DEFAULT_CONFIG.get(key))
 
     def set(self, key, value):
-        self.config[key] = value
-        self.save()
+        """Validates and applies one value; published at once, or when the batch ends."""
+        with self._lock:
+            base = self._working if self._batch_depth else self.snapshot
+            new = base.replace({key: value})
+            self._pending.update(new.diff(base, (key,)))
+            if self._batch_depth:
+                self._working = new
+                return
+            self.snapshot = new
+        self._commit()
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups several set() calls into one commit: the new snapshot is
+        published, subscribers are notified and the file is written once,
+        when the outermost batch exits. If the body raises, the whole
+        transaction is discarded and the exception propagates.
+        """
+        with self._lock:
+            if self._batch_depth == 0:
+                self._working = self.snapshot
+                self._batch_owner = threading.get_ident()
+                self._failed = False
+            self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._failed = True  # Poisons the outer batches too
+            raise
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+                if outermost:
+                    if self._failed:
+                        self._pending = {}
+                    else:
+                        self.snapshot = self._working
+                    self._working = None
+                    self._batch_owner = None
+            if outermost and not self._failed:
+                self._commit()
+
+    def _commit(self):
+        with self._lock:
+            changed = self._pending
+            self._pending = {}
+        if not changed:
+            return
+        self.schedule_save()
+        self._notify(changed)
+
+    # ── Change notifications ──
+
+    def set_dispatcher(self, dispatcher):
+        """
+        Sets the function used to deliver notifications, e.g. one that
+        schedules the callback on the Tk thread. None calls subscribers inline.
+        """
+        self._dispatcher = dispatcher
+
+    def subscribe(self, keys, callback):
+        """
+        Calls callback(changed) once per committed change touching any of
+        the given keys. `changed` maps only the subscribed keys that changed
+        to their new values. Returns a token for unsubscribe().
+        """
+        token = (frozenset(keys), callback)
+        self._subscribers.append(token)
+        return token
+
+    def unsubscribe(self, token):
+        try:
+            self._subscribers.remove(token)
+        except ValueError:
+            pass
+
+    def _notify(self, changed):
+        for keys, callback in list(self._subscribers):
+            relevant = {k: v for k, v in changed.items() if k in keys}
+            if not relevant:
+                continue
+            if self._dispatcher:
+                self._dispatcher(lambda cb=callback, c=relevant: self._deliver(cb, c))
+            else:
+                self._deliver(callback, relevant)
+
+    def _deliver(self, callback, changed):
+        try:
+            callback(changed)
+        except Exception as e:
+            logger.error(f"Error in config subscriber: {e}")
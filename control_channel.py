@@ -0,0 +1,127 @@
+"""
+Local control endpoint of the running instance.
+
+The first instance listens on a named pipe (Windows) or a Unix socket
+(elsewhere; used by tests and headless runs). A second launch sends its
+command-line arguments there and exits instead of cold-starting, so
+scripts can run e.g. `RDPHeartbeat.exe --color #FF0000` or `--hide`
+against the running process.
+
+Messages are one JSON object per connection, read with recv_bytes (never
+unpickled): {"argv": [...]} in, {"ok": true} or {"ok": false, "error": ...} out.
+"""
+import getpass
+import json
+import os
+import platform
+import tempfile
+import threading
+from multiprocessing.connection import Client, Listener
+import win_utils
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_MESSAGE_BYTES = 64 * 1024
+REPLY_TIMEOUT_S = 2.0
+
+
+def _safe_name(text):
+    return "".join(c if c.isalnum() else "_" for c in text)
+
+
+def get_address():
+    """
+    Returns (address, family) of the endpoint for this user and session.
+    Pipe names are machine-wide, so the user and session are part of it.
+    """
+    user = _safe_name(getpass.getuser())
+    if platform.system() == "Windows":
+        return rf"\\.\pipe\RDPHeartbeat-{user}-{win_utils.get_session_id()}", "AF_PIPE"
+    return os.path.join(tempfile.gettempdir(), f"rdpheartbeat-{user}.sock"), "AF_UNIX"
+
+
+class ControlServer:
+    """
+    Accepts connections on a daemon thread and passes each received argv
+    list to handler(argv), on that thread; handler raises to report an error.
+    """
+
+    def __init__(self, handler, address=None, family=None):
+        self.handler = handler
+        if address is None:
+            address, family = get_address()
+        self.address = address
+        self.family = family
+        self._listener = None
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        try:
+            if self.family == "AF_UNIX" and os.path.exists(self.address):
+                os.unlink(self.address)  # Stale socket from a crashed instance
+            self._listener = Listener(self.address, self.family)
+        except OSError as e:
+            logger.error(f"Failed to open control endpoint {self.address}: {e}")
+            return False
+        if self.family == "AF_UNIX":
+            os.chmod(self.address, 0o600)
+        self._thread = threading.Thread(target=self._run, name="ControlServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Control endpoint listening on {self.address}")
+        return True
+
+    def stop(self):
+        self._stopping = True
+        if self._listener:
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            self._listener = None
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AttributeError):
+                if self._stopping:
+                    return
+                continue
+            try:
+                with conn:
+                    self._serve(conn)
+            except Exception as e:
+                logger.error(f"Control connection error: {e}")
+
+    def _serve(self, conn):
+        try:
+            message = json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES).decode("utf-8"))
+            argv = message["argv"]
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise ValueError("argv must be a list of strings")
+            logger.info(f"Control command: {argv}")
+            self.handler(argv)
+            reply = {"ok": True}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        conn.send_bytes(json.dumps(reply).encode("utf-8"))
+
+
+def send_command(argv, address=None, family=None, timeout=REPLY_TIMEOUT_S):
+    """
+    Sends argv to the running instance. Returns its reply dict, or None if
+    no instance is listening or it did not answer in time.
+    """
+    if address is None:
+        address, family = get_address()
+    try:
+        with Client(address, family) as conn:
+            conn.send_bytes(json.dumps({"argv": list(argv)}).encode("utf-8"))
+            if not conn.poll(timeout):
+                return None
+            return json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES).decode("utf-8"))
+    except (OSError, EOFError, ValueError) as e:
+        logger.warning(f"Could not reach running instance at {address}: {e}")
+        return None
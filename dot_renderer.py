@@ -0,0 +1,95 @@
+from array import array
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+
+# Render the disc this many times larger, then downsample for antialiasing
+SUPERSAMPLE = 4
+
+
+def parse_hex_color(color):
+    """Returns (r, g, b) for "#RRGGBB"."""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def render_coverage_mask(size, supersample=SUPERSAMPLE):
+    """
+    Returns an 'L' image of the dot's antialiased coverage (0-255), matching
+    the 1 px padding of the Tk canvas oval.
+    """
+    big = size * supersample
+    mask = Image.new("L", (big, big), 0)
+    pad = supersample
+    ImageDraw.Draw(mask).ellipse((pad, pad, big - pad - 1, big - pad - 1), fill=255)
+    return mask.resize((size, size), Image.LANCZOS)
+
+
+class DotAtlas:
+    """
+    Every distinct alpha level of one dot (color, size) pre-rendered as
+    premultiplied BGRA, stacked vertically into a single top-down bitmap.
+
+    Frame for alpha byte `a` starts at row index[a] * size; index is -1 for
+    levels that are not in the atlas.
+    """
+
+    def __init__(self, color, size, levels, supersample=SUPERSAMPLE):
+        self.color = color
+        self.size = size
+        self.levels = tuple(sorted(set(levels)))
+        self.index = array('h', [-1] * 256)
+
+        r, g, b = parse_hex_color(color)
+        mask = render_coverage_mask(size, supersample)
+        sheet = Image.new("RGBA", (size, size * len(self.levels)))
+        for row, level in enumerate(self.levels):
+            alpha = mask.point(lambda v, a=level: v * a // 255)
+            # Premultiplied color channels, in B, G, R, A memory order
+            frame = Image.merge("RGBA", (
+                alpha.point(lambda v: v * b // 255),
+                alpha.point(lambda v: v * g // 255),
+                alpha.point(lambda v: v * r // 255),
+                alpha,
+            ))
+            sheet.paste(frame, (0, row * size))
+            self.index[level] = row
+        self.pixels = sheet.tobytes()
+
+    @property
+    def frame_count(self):
+        return len(self.levels)
+
+    def frame_bytes(self, alpha_byte):
+        """Returns the BGRA bytes of a single frame (mostly for tests)."""
+        row = self.index[alpha_byte]
+        if row < 0:
+            raise KeyError(alpha_byte)
+        stride = self.size * self.size * 4
+        return self.pixels[row * stride:(row + 1) * stride]
+
+
+class AtlasCache:
+    """LRU cache of DotAtlas objects keyed by color, size and alpha levels."""
+
+    def __init__(self, capacity=4):
+        self.capacity = capacity
+        self._atlases = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, color, size, levels):
+        key = (color.upper(), size, bytes(sorted(set(levels))))
+        atlas = self._atlases.get(key)
+        if atlas is not None:
+            self._atlases.move_to_end(key)
+            self.hits += 1
+            return atlas
+
+        self.misses += 1
+        atlas = DotAtlas(color, size, key[2])
+        self._atlases[key] = atlas
+        while len(self._atlases) > self.capacity:
+            self._atlases.popitem(last=False)
+        return atlas
+
+    def __len__(self):
+        return len(self._atlases)
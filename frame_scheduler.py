@@ -0,0 +1,104 @@
+import time
+import win_utils
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+NS_PER_MS = 1_000_000
+
+
+class FrameScheduler:
+    """
+    Runs a frame callback on absolute deadlines instead of chaining
+    after(period) calls, so the callback's own run time and Tk timer slop
+    don't accumulate into drift.
+
+    Each re-arm is shortened by however late the current frame fired. If the
+    loop falls a whole period or more behind, the missed frames are dropped
+    (not replayed) and the callback is told how many frames elapsed so it can
+    keep its phase tied to wall-clock time.
+
+    `root` only needs after() and after_cancel(), so a fake works for tests.
+    """
+
+    def __init__(self, root, callback, period_ms, clock=time.monotonic_ns, high_res_timer=False):
+        self.root = root
+        self.callback = callback
+        self.clock = clock
+        self.period_ns = max(1, int(period_ms)) * NS_PER_MS
+        self.high_res_timer = high_res_timer
+
+        self.running = False
+        self.next_deadline_ns = 0
+        self.last_lateness_ns = 0  # How late the most recent frame fired (>= 0)
+        self.last_tick_ns = 0      # Monotonic time the most recent frame fired
+        self.frames = 0
+        self.dropped_frames = 0
+
+        self._after_id = None
+        self._timer_resolution_held = False
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        if self.high_res_timer:
+            self._timer_resolution_held = win_utils.begin_timer_resolution()
+        self.next_deadline_ns = self.clock() + self.period_ns
+        self._arm(self.clock())
+
+    def stop(self):
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._timer_resolution_held:
+            win_utils.end_timer_resolution()
+            self._timer_resolution_held = False
+
+    def set_period(self, period_ms):
+        """Changes the frame period; takes effect from the next deadline."""
+        period_ns = max(1, int(period_ms)) * NS_PER_MS
+        if period_ns == self.period_ns:
+            return
+        self.period_ns = period_ns
+        if self.running:
+            # Re-anchor so a longer period doesn't look like a burst of dropped frames
+            self.next_deadline_ns = self.clock() + period_ns
+            if self._after_id is not None:
+                self.root.after_cancel(self._after_id)
+            self._arm(self.clock())
+
+    def _arm(self, now_ns):
+        delay_ms = (self.next_deadline_ns - now_ns + NS_PER_MS // 2) // NS_PER_MS
+        self._after_id = self.root.after(max(0, delay_ms), self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        if not self.running:
+            return
+
+        now = self.clock()
+        self.last_tick_ns = now
+        period = self.period_ns
+        lateness = now - self.next_deadline_ns
+        # Full lateness against the original deadline, before dropping frames
+        self.last_lateness_ns = lateness if lateness > 0 else 0
+        elapsed = 1
+        if lateness >= period:
+            # Fell behind: skip the missed deadlines instead of catching up
+            missed = lateness // period
+            self.next_deadline_ns += missed * period
+            self.dropped_frames += missed
+            elapsed += missed
+        self.next_deadline_ns += period
+        self.frames += 1
+
+        try:
+            self.callback(elapsed)
+        finally:
+            if self.running:
+                self._arm(self.clock())
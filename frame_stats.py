@@ -0,0 +1,112 @@
+from array import array
+
+NS_PER_MS = 1_000_000
+
+# Histogram bucket i holds intervals in [2^(i-1), 2^i) ms; bucket 0 is < 1 ms.
+# The last bucket collects everything from ~16 s up.
+HISTOGRAM_BUCKETS = 16
+
+
+class FrameIntervalRecorder:
+    """
+    Records the actual interval between consecutive frames.
+
+    Intervals go into a fixed-size array-backed ring buffer and a
+    log2-bucketed histogram, so recording a tick never grows a container.
+    Percentiles are computed on demand from the ring (the rolling window),
+    not per tick.
+    """
+
+    def __init__(self, capacity=1200):
+        self.capacity = capacity
+        self.intervals = array('q', bytes(8 * capacity))
+        self.histogram = array('q', bytes(8 * HISTOGRAM_BUCKETS))
+        self.count = 0          # Total intervals recorded
+        self.max_ns = 0         # Worst interval since start/reset
+        self._pos = 0
+        self._last_tick_ns = None
+
+    def record_tick(self, now_ns):
+        """Call once per frame with the frame's monotonic timestamp."""
+        last = self._last_tick_ns
+        self._last_tick_ns = now_ns
+        if last is not None:
+            self.record(now_ns - last)
+
+    def record(self, interval_ns):
+        pos = self._pos
+        self.intervals[pos] = interval_ns
+        pos += 1
+        self._pos = 0 if pos == self.capacity else pos
+        self.count += 1
+        if interval_ns > self.max_ns:
+            self.max_ns = interval_ns
+
+        bucket = (interval_ns // NS_PER_MS).bit_length()
+        if bucket >= HISTOGRAM_BUCKETS:
+            bucket = HISTOGRAM_BUCKETS - 1
+        self.histogram[bucket] += 1
+
+    def mark_gap(self):
+        """Forgets the previous tick so a deliberate pause isn't counted as a stall."""
+        self._last_tick_ns = None
+
+    def reset(self):
+        for i in range(self.capacity):
+            self.intervals[i] = 0
+        for i in range(HISTOGRAM_BUCKETS):
+            self.histogram[i] = 0
+        self.count = 0
+        self.max_ns = 0
+        self._pos = 0
+        self._last_tick_ns = None
+
+    def window(self):
+        """Returns the intervals currently held in the ring, oldest first."""
+        if self.count < self.capacity:
+            return list(self.intervals[:self.count])
+        return list(self.intervals[self._pos:]) + list(self.intervals[:self._pos])
+
+    def summary(self):
+        """
+        Returns p50/p95/p99/max (in ms) over the rolling window, or None if
+        fewer than two frames were seen. "max_all" covers the whole run.
+        """
+        values = sorted(self.window())
+        n = len(values)
+        if not n:
+            return None
+
+        def pct(q):
+            return values[min(n - 1, int(q * n))] / NS_PER_MS
+
+        return {
+            "samples": n,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+            "max": values[-1] / NS_PER_MS,
+            "max_all": self.max_ns / NS_PER_MS,
+        }
+
+    def histogram_summary(self):
+        """Returns [(label, count)] for non-empty histogram buckets."""
+        rows = []
+        for i, c in enumerate(self.histogram):
+            if not c:
+                continue
+            if i == 0:
+                label = "<1ms"
+            elif i == HISTOGRAM_BUCKETS - 1:
+                label = f">={1 << (i - 1)}ms"
+            else:
+                label = f"{1 << (i - 1)}-{(1 << i) - 1}ms"
+            rows.append((label, c))
+        return rows
+
+    def format_summary(self):
+        s = self.summary()
+        if s is None:
+            return "no samples"
+        return (f"p50 {s['p50']:.0f} ms · p95 {s['p95']:.0f} ms · "
+                f"p99 {s['p99']:.0f} ms · max {s['max']:.0f} ms")
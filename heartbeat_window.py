@@ -1,72 +1,201 @@
+import platform
+import time
 import tkinter as tk
 import win_utils
+from waveform import Waveform
+from frame_scheduler import FrameScheduler
+from frame_stats import FrameIntervalRecorder
+from session_monitor import create_session_monitor
+from monitors import MonitorTopology, create_monitor_provider
+from indicator import DotWindow, Indicator
+from command_queue import CommandQueue, SHOW, HIDE, TOGGLE_MOVE, PROFILE, EXIT
 from config_manager import ConfigManager
 from logger import get_logger
 
 logger = get_logger(__name__)
 
-class BreatheWindow(tk.Tk):
-    def __init__(self, config_manager=None):
+# Heartbeat health, as reported to the tray icon
+HEALTHY = "healthy"
+LAGGING = "lagging"
+STALLED = "stalled"
+
+class BreatheWindow(DotWindow, tk.Tk):
+    # How often config.json is stat()ed for external edits
+    CONFIG_CHECK_MS = 3000
+
+    # How often frame timing percentiles are written to the log
+    FRAME_STATS_LOG_MS = 60_000
+
+    # Frames in a row under the threshold before the lag color clears
+    LAG_RECOVERY_FRAMES = 20
+
+    # While the tray status icon is on, the event loop stamps a liveness time
+    # this often (the idle command poll stamps it while paused); health()
+    # reports a stall once the stamp is older than HEALTH_STALL_MS
+    HEALTH_STAMP_MS = 500
+    HEALTH_STALL_MS = 2000
+
+    # While the animation is paused there is no frame to drain commands in,
+    # so the queue is polled at this rate instead. Slow on purpose: a hidden
+    # or locked dot should cost next to no wakeups, and producers can't wake
+    # the Tk thread directly (after() is not safe to call from their threads)
+    COMMAND_IDLE_POLL_MS = 1000
+
+    LAG_KEYS = ("lag_indicator", "lag_warn_ms", "lag_critical_ms", "lag_warn_color", "lag_critical_color")
+
+    # Swapped for fakes by the headless simulation (simulation.py)
+    canvas_class = tk.Canvas
+    indicator_class = Indicator
+
+    INDICATOR_KEYS = ("indicators", "indicator_on_every_monitor")
+
+    POSITION_KEYS = ("window_x", "window_y", "window_monitor", "window_rel_x", "window_rel_y")
+
+    WATCHED_KEYS = ("dot_color", "dot_size", "always_on_top", "opacity_min", "opacity_max",
+                    "pulse_speed_ms", "pulse_curve", "tray_status_icon") + POSITION_KEYS + LAG_KEYS + INDICATOR_KEYS
+
+    def __init__(self, config_manager=None, backend=None, session_monitor=None, clock=time.monotonic_ns,
+                 monitor_provider=None):
         super().__init__()
 
-        # Load Config
+        # Window-style backend (Win32 on Windows, in-memory fake elsewhere)
+        self.win32 = backend or win_utils.get_backend()
+
+        # Load Config (self.cfg.snapshot is the current, validated config)
         self.config_manager = config_manager or ConfigManager()
         self.cfg = self.config_manager
 
         self.title("RDP Heartbeat")
         self.overrideredirect(True)
-        self.attributes("-topmost", self.cfg.get("always_on_top"))
-        self.attributes("-toolwindow", True) # Hide from taskbar
+        self.attributes("-topmost", self.cfg.snapshot.always_on_top)
+        if platform.system() == "Windows":
+            self.attributes("-toolwindow", True) # Hide from taskbar
 
         # Background color for transparency
         self.bg_color = "#000001"
         self.config(bg=self.bg_color)
 
         # Dimensions
-        self.size = self.cfg.get("dot_size")
+        self.size = self.cfg.snapshot.dot_size
+
+        # Animation State: one precomputed breathing cycle of alpha bytes
+        cfg = self.cfg.snapshot
+        self.waveform = Waveform(cfg.pulse_curve, cfg.opacity_min, cfg.opacity_max, cfg.pulse_speed_ms)
+        self.alpha_byte = self.waveform.current()
+        self.pulse_speed_ms = cfg.pulse_speed_ms
+
+        # Renderer: "color_key" draws a Tk oval behind the #000001 color key,
+        # "per_pixel_alpha" pushes pre-rendered antialiased frames with
+        # UpdateLayeredWindow. Chosen at startup.
+        self.per_pixel = self.cfg.snapshot.renderer == "per_pixel_alpha"
+        self.init_dot_state()
+        self._atlas_cache = None
+        if self.per_pixel:
+            from dot_renderer import AtlasCache
+            self._atlas_cache = AtlasCache()
+
+        # Monitor layout, refreshed only on display/work-area change notifications
+        self.topology = MonitorTopology(monitor_provider or create_monitor_provider())
 
         # Position (Bottom Right of WORK AREA)
         self.update_position()
 
         # Canvas for the dot
-        self.canvas = tk.Canvas(self, width=self.size, height=self.size,
+        self.canvas = self.canvas_class(self, width=self.size, height=self.size,
                                 bg=self.bg_color, highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
+        # Local event-loop lag level: 0 ok, 1 warn, 2 critical
+        self.lag_level = 0
+        self._lag_calm_frames = 0
+        self.load_lag_settings()
+
         # Draw Circle
-        self.dot_color = self.cfg.get("dot_color")
+        self.dot_color = self.cfg.snapshot.dot_color
         self.draw_dot()
 
         # Interaction State
         self.move_mode = False
+        # Drag: pointer and window origin captured at button press; motion
+        # events only store the target, applied at most once per frame
+        self._drag_origin = None
+        self._drag_target = None
 
-        # State tracking for config changes
-        self._last_config_x = self.cfg.get("window_x")
-
-        # Animation State
-        self.alpha = 0.8
-        self.fading_out = True
+        # React to settings edits instead of polling config every tick.
+        # Notifications are delivered on the Tk thread.
+        self.cfg.set_dispatcher(lambda fn: self.after(0, fn))
+        self.cfg.subscribe(self.WATCHED_KEYS, self.on_config_changed)
 
         # Bind the Map event to ensure we apply styles exactly when the window appears
         self.bind("<Map>", self.apply_window_styles)
 
-        # Optimization: Track last applied alpha to avoid redundant API calls
-        self._last_applied_alpha_int = -1
-
-        # Start animation loop
-        self.pulse()
+        self.indicators = []
+
+        # Actual frame-to-frame intervals (jitter/stall measurement)
+        self.frame_stats = FrameIntervalRecorder()
+        self.tray_controller = None
+        self.clock = clock
+        self._loop_alive_ns = clock()
+
+        # Requests from the tray / control threads; drained once per frame
+        self.commands = CommandQueue(clock=clock)
+        self.commands.register(SHOW, lambda payload: self.show())
+        self.commands.register(HIDE, lambda payload: self.hide())
+        self.commands.register(TOGGLE_MOVE, lambda payload: self.toggle_move_mode())
+        self.commands.register(PROFILE, self.start_profiling)
+        self.commands.register(EXIT, lambda payload: self.destroy())
+        self._idle_poll_id = None
+
+        # On-demand cProfile + tracemalloc window (profiler.py)
+        self._profiling = None
+        self._profiling_start_frame = 0
+
+        # Start animation loop on absolute, drift-compensated deadlines
+        self.scheduler = FrameScheduler(self, self.pulse, self.pulse_speed_ms, clock=clock,
+                                        high_res_timer=self.cfg.snapshot.high_res_timer)
+        self.scheduler.start()
+
+        # Suspend the timer entirely while nobody can see the dot
+        self._suspend_reasons = set()
+        self.session_monitor = session_monitor or create_session_monitor()
+        self.session_monitor.add_listener(
+            lambda reason, active: self.after(0, self.set_suspended, reason, active))
+        self.session_monitor.add_display_listener(lambda: self.after(0, self.on_display_changed))
+        self.session_monitor.start()
+
+        # Extra dots (other monitors, next to the connection bar...), all
+        # driven by this window's scheduler
+        self.sync_indicators()
+
+        # Pick up edits made to config.json by other tools
+        self.after(self.CONFIG_CHECK_MS, self.check_config_file)
+        self.after(self.FRAME_STATS_LOG_MS, self.log_frame_stats)
+        self._stamp_id = None
+        self.update_health_stamp()
 
     def update_position(self):
-        try:
-            left, top, right, bottom = win_utils.get_work_area()
-        except:
+        cfg = self.cfg.snapshot
+        x, y = cfg.window_x, cfg.window_y
+        monitor = self.topology.by_name(cfg.window_monitor)
+        rel_x, rel_y = cfg.window_rel_x, cfg.window_rel_y
+
+        if x is not None and y is not None and monitor and rel_x is not None and rel_y is not None:
+            # Same monitor is still attached: restore relative to its work area
+            x = monitor.work[0] + int(rel_x)
+            y = monitor.work[1] + int(rel_y)
+        elif x is not None and y is not None:
+            monitor = self.topology.monitor_for_point(int(x), int(y))
+        if monitor is None:
+            monitor = self.topology.primary()
+
+        if monitor is not None:
+            left, top, right, bottom = monitor.work
+        else:
+            # No topology available (non-Windows): whole Tk screen
             left, top = 0, 0
             right = self.winfo_screenwidth()
             bottom = self.winfo_screenheight()
 
-        x = self.cfg.get("window_x")
-        y = self.cfg.get("window_y")
-
         if x is not None and y is not None:
             # Clamp to screen boundaries to prevent clipping
             try:
@@ -91,136 +220,370 @@ class BreatheWindow(tk.Tk):
         self.geometry(f"{self.size}x{self.size}+{x}+{y}")
         self.update_idletasks()
 
+    def rebase_position(self):
+        """
+        Re-derives window_monitor / window_rel_* from window_x / window_y.
+        For absolute positions set without them (hot reload, deployment
+        tools), which would otherwise lose to the stale relative ones.
+        """
+        cfg = self.cfg.snapshot
+        x, y = cfg.window_x, cfg.window_y
+        monitor = self.topology.monitor_for_point(x, y) if x is not None and y is not None else None
+        with self.cfg.batch():
+            self.cfg.set("window_monitor", monitor.name if monitor else None)
+            self.cfg.set("window_rel_x", x - monitor.work[0] if monitor else None)
+            self.cfg.set("window_rel_y", y - monitor.work[1] if monitor else None)
+
+    def on_display_changed(self):
+        """Monitor layout or work area changed: rebuild the cache and re-place the dots."""
+        self.topology.refresh()
+        self.update_position()
+        self.sync_indicators()
+
+    def indicator_specs(self):
+        """Configured extra indicators, plus one per other monitor if enabled."""
+        specs = list(self.cfg.snapshot.indicators)
+        if self.cfg.snapshot.indicator_on_every_monitor:
+            own = self.topology.monitor_for_point(self.winfo_x(), self.winfo_y()) or self.topology.primary()
+            specs += [{"monitor": m.name} for m in self.topology.monitors if m is not own]
+        return specs
+
+    def sync_indicators(self):
+        """Creates, re-specs or destroys indicator windows to match the config."""
+        specs = self.indicator_specs()
+        while len(self.indicators) > len(specs):
+            self.indicators.pop().destroy()
+        for index, spec in enumerate(specs):
+            try:
+                if index < len(self.indicators):
+                    self.indicators[index].apply_spec(spec)
+                else:
+                    indicator = self.indicator_class(self, index, spec)
+                    if "hidden" in self._suspend_reasons:
+                        indicator.withdraw()
+                    self.indicators.append(indicator)
+            except Exception as e:
+                logger.error(f"Error setting up indicator {index + 1}: {e}")
+
     def toggle_move_mode(self):
         self.move_mode = not self.move_mode
         hwnd = getattr(self, '_cached_hwnd', self.winfo_id())
 
         if self.move_mode:
-            win_utils.remove_click_through(hwnd)
+            self.win32.remove_click_through(hwnd)
             self.canvas.config(highlightthickness=2, highlightbackground="#FF0000")
             self.canvas.bind("<Button-1>", self.start_drag)
             self.canvas.bind("<B1-Motion>", self.on_drag)
             self.canvas.bind("<ButtonRelease-1>", self.end_drag)
         else:
-            win_utils.set_click_through(hwnd)
+            self.win32.set_click_through(hwnd)
             self.canvas.config(highlightthickness=0)
             self.canvas.unbind("<Button-1>")
             self.canvas.unbind("<B1-Motion>")
             self.canvas.unbind("<ButtonRelease-1>")
 
+        if self.tray_controller:
+            self.tray_controller.set_moving(self.move_mode)
+
     def start_drag(self, event):
-        self._drag_start_x = event.x
-        self._drag_start_y = event.y
+        self._drag_origin = (event.x_root, event.y_root, self.winfo_x(), self.winfo_y())
+        self._drag_target = None
 
     def on_drag(self, event):
-        deltax = event.x - self._drag_start_x
-        deltay = event.y - self._drag_start_y
-        x = self.winfo_x() + deltax
-        y = self.winfo_y() + deltay
+        if self._drag_origin is None:
+            return
+        pointer_x, pointer_y, window_x, window_y = self._drag_origin
+        self._drag_target = (window_x + event.x_root - pointer_x, window_y + event.y_root - pointer_y)
+
+    def apply_drag(self):
+        """Moves the window to the latest drag target (once per frame, from pulse)."""
+        x, y = self._drag_target
+        self._drag_target = None
         self.geometry(f"+{x}+{y}")
+        return x, y
 
     def end_drag(self, event):
-        self.cfg.set("window_x", self.winfo_x())
-        self.cfg.set("window_y", self.winfo_y())
-
-    def draw_dot(self):
-        self.canvas.delete("all")
-        padding = 1
-        self.oval = self.canvas.create_oval(padding, padding,
-                                            self.size-padding, self.size-padding,
-                                            fill=self.dot_color, outline="")
+        if self._drag_origin is None:
+            return
+        self.on_drag(event)
+        x, y = self.apply_drag()
+        self._drag_origin = None
+        monitor = self.topology.monitor_for_point(x, y)
+        # One transaction, so the final position is a single config write
+        with self.cfg.batch():
+            self.cfg.set("window_x", x)
+            self.cfg.set("window_y", y)
+            self.cfg.set("window_monitor", monitor.name if monitor else None)
+            self.cfg.set("window_rel_x", x - monitor.work[0] if monitor else None)
+            self.cfg.set("window_rel_y", y - monitor.work[1] if monitor else None)
+
+    def load_lag_settings(self):
+        """Precomputes lag thresholds (ns) and colors so the tick only compares ints."""
+        cfg = self.cfg.snapshot
+        if cfg.lag_indicator:
+            self._lag_warn_ns = cfg.lag_warn_ms * 1_000_000
+            self._lag_critical_ns = cfg.lag_critical_ms * 1_000_000
+        else:
+            # Unreachable thresholds: level stays 0 without an extra branch per tick
+            self._lag_warn_ns = self._lag_critical_ns = 1 << 62
+        self._lag_colors = (None, cfg.lag_warn_color, cfg.lag_critical_color)
+
+    def current_color(self):
+        """Configured dot color, or the lag color while the local loop is late."""
+        return self._lag_colors[self.lag_level] or self.dot_color
+
+    def set_lag_level(self, level):
+        if level == self.lag_level:
+            return
+        if level > self.lag_level:
+            logger.warning(f"Heartbeat event loop is late by {self.scheduler.last_lateness_ns / 1e6:.0f} ms")
+        self.lag_level = level
+        self.draw_dot()
+        for indicator in self.indicators:
+            indicator.draw_dot()
 
-    def apply_window_styles(self, event=None):
-        """
-        Applies the Windows-specific styles for transparency and click-through.
-        This must be called AFTER the window is mapped by the OS.
-        """
-        try:
-            # Try to get the specific HWND for the top-level window by title
-            # This ensures we get the correct handle even with overrideredirect
-            hwnd = win_utils.find_window_by_title(self.title())
-            if not hwnd:
-                hwnd = self.winfo_id()
-
-            self._cached_hwnd = hwnd
-
-            # 1. Ensure the window has the WS_EX_LAYERED style
-            if self.move_mode:
-                win_utils.remove_click_through(hwnd)
-            else:
-                win_utils.set_click_through(hwnd)
-
-            # 2. Set the transparency key and initial alpha
-            win_utils.set_layered_attributes(hwnd, self.bg_color, self.alpha)
-        except Exception as e:
-            logger.error(f"Error setting window styles: {e}")
-
-    def pulse(self):
-        # Reload key config items in case they changed (simple live reload)
-        # For a more robust solution, we'd use an observer pattern, but this is lightweight.
-        new_color = self.cfg.get("dot_color")
-        if new_color != self.dot_color:
-            self.dot_color = new_color
+    def on_config_changed(self, changed):
+        """Applies committed config changes. Runs on the Tk thread."""
+        if "dot_color" in changed:
+            self.dot_color = changed["dot_color"]
             self.draw_dot()
 
-        new_size = self.cfg.get("dot_size")
-        size_changed = new_size != self.size
-
-        # Check if position was reset in config (changed from having value to None)
-        # We need to track the 'custom position' state to detect this transition
-        current_x_config = self.cfg.get("window_x")
-        position_reset = (self._last_config_x is not None) and (current_x_config is None)
-        self._last_config_x = current_x_config
+        # Position reset to default or edited externally. Dragging commits the
+        # same coordinates the window already has, so re-applying is harmless.
+        position_changed = bool(changed.keys() & set(self.POSITION_KEYS))
+        if changed.keys() & {"window_x", "window_y"} and not changed.keys() & set(self.POSITION_KEYS[2:]):
+            self.rebase_position()
 
-        if size_changed or position_reset:
-            self.size = new_size
+        if "dot_size" in changed or position_changed:
+            self.size = self.cfg.snapshot.dot_size
             self.update_position()
             self.draw_dot()
 
-        # Check Always on Top change
-        always_on_top = self.cfg.get("always_on_top")
-        # Note: -topmost returns 1/0, config has True/False
-        current_top = self.attributes("-topmost")
-        if bool(current_top) != always_on_top:
-            self.attributes("-topmost", always_on_top)
+        if "always_on_top" in changed:
+            self.attributes("-topmost", changed["always_on_top"])
             # Re-apply styles as attributes() can reset them on some Windows versions
             self.apply_window_styles()
+            for indicator in self.indicators:
+                indicator.attributes("-topmost", changed["always_on_top"])
+                indicator.apply_window_styles()
+
+        # Indicators inherit the main dot's color and size unless they set their own
+        if changed.keys() & {"dot_color", "dot_size", *self.POSITION_KEYS, *self.INDICATOR_KEYS}:
+            self.sync_indicators()
+
+        if changed.keys() & {"opacity_min", "opacity_max", "pulse_speed_ms", "pulse_curve"}:
+            cfg = self.cfg.snapshot
+            self.pulse_speed_ms = cfg.pulse_speed_ms
+            # Only rebuilds the table when one of its parameters changed
+            self.waveform.update(cfg.pulse_curve,
+                                 cfg.opacity_min,
+                                 cfg.opacity_max,
+                                 self.pulse_speed_ms)
+            self.scheduler.set_period(self.pulse_speed_ms)
+            if self.per_pixel:
+                # Alpha levels may have changed
+                self.rebuild_atlas()
+                for indicator in self.indicators:
+                    indicator.rebuild_atlas()
+
+        if "tray_status_icon" in changed:
+            self.update_health_stamp()
+
+        if changed.keys() & set(self.LAG_KEYS):
+            self.load_lag_settings()
+            self.lag_level = 0
+            self._lag_calm_frames = 0
+            self.draw_dot()
+            for indicator in self.indicators:
+                indicator.draw_dot()
 
-        step = 0.05
-        min_alpha = self.cfg.get("opacity_min")
-        max_alpha = self.cfg.get("opacity_max")
+    def check_config_file(self):
+        try:
+            self.cfg.check_for_external_changes()
+        except Exception as e:
+            logger.error(f"Error checking config file: {e}")
+        finally:
+            # Always re-arm, or hot reload would stop for the rest of the session
+            self.after(self.CONFIG_CHECK_MS, self.check_config_file)
 
-        if self.fading_out:
-            self.alpha -= step
-            if self.alpha <= min_alpha:
-                self.alpha = min_alpha
-                self.fading_out = False
-        else:
-            self.alpha += step
-            if self.alpha >= max_alpha:
-                self.alpha = max_alpha
-                self.fading_out = True
+    def update_health_stamp(self):
+        """
+        Runs the liveness stamp timer only while the tray status icon is on
+        and the animation runs; nothing else reads the stamp, and while paused
+        the idle command poll keeps it fresh.
+        """
+        wanted = self.cfg.snapshot.tray_status_icon and not self._suspend_reasons
+        if wanted and self._stamp_id is None:
+            self.stamp_loop_alive()
+        elif not wanted and self._stamp_id is not None:
+            self.after_cancel(self._stamp_id)
+            self._stamp_id = None
+
+    def stamp_loop_alive(self):
+        self._loop_alive_ns = self.clock()
+        self._stamp_id = self.after(self.HEALTH_STAMP_MS, self.stamp_loop_alive)
+
+    def health(self):
+        """
+        HEALTHY, LAGGING or STALLED; None when the tray status icon is off.
+        Called from the tray thread, so it only reads plain attributes.
+        """
+        if not self.cfg.snapshot.tray_status_icon:
+            return None
+        if self.clock() - self._loop_alive_ns > self.HEALTH_STALL_MS * 1_000_000:
+            return STALLED
+        return LAGGING if self.lag_level else HEALTHY
+
+    def log_frame_stats(self):
+        stats = self.frame_stats.summary()
+        if stats:
+            hist = ", ".join(f"{label}: {count}" for label, count in self.frame_stats.histogram_summary())
+            logger.info(f"Frame timing over {stats['samples']} frames: {self.frame_stats.format_summary()} "
+                        f"(max since start {stats['max_all']:.0f} ms, dropped {self.scheduler.dropped_frames}) "
+                        f"histogram [{hist}]")
+
+        commands = self.commands.format_summary()
+        if commands:
+            logger.info(f"Command latency: {commands}")
+
+        # pystray builds the menu up front, so refresh it to show the new numbers
+        if self.tray_controller:
+            self.tray_controller.request_menu_update()
+        self.after(self.FRAME_STATS_LOG_MS, self.log_frame_stats)
+
+    def start_profiling(self, duration_s=None):
+        """Profiles the Tk loop for duration_s seconds, then writes reports to the log dir."""
+        if self._profiling is not None:
+            logger.info("Profiling already running")
+            return
+        from profiler import ProfilingSession, clamp_duration
+        session = ProfilingSession(clamp_duration(duration_s))
+        # Arm the stop timer first: profiling must never outlive its window
+        stop_id = self.after(int(session.duration_s * 1000), self.stop_profiling)
+        try:
+            session.start()
+        except Exception as e:
+            self.after_cancel(stop_id)
+            logger.error(f"Error starting profiling: {e}")
+            return
+        self._profiling = session
+        self._profiling_start_frame = self.scheduler.frames
+        logger.info(f"Profiling for {session.duration_s:g} s")
+
+    def stop_profiling(self):
+        session, self._profiling = self._profiling, None
+        if session is None:
+            return
+        try:
+            session.stop(ticks=self.scheduler.frames - self._profiling_start_frame)
+        except Exception as e:
+            logger.error(f"Error writing profiling reports: {e}")
 
-        # Optimization: Only call Windows API if the visible alpha value changes
-        current_alpha_int = int(self.alpha * 255)
-        current_alpha_int = max(0, min(255, current_alpha_int))
+    def call_on_first_pulse(self, callback):
+        """
+        Runs callback() once, right before the next pulse. Swaps the
+        scheduler's callback so later frames pay nothing for it.
+        """
+        pulse = self.scheduler.callback
 
-        if current_alpha_int != self._last_applied_alpha_int:
+        def first_pulse(frames):
+            self.scheduler.callback = pulse
             try:
-                # Use cached HWND if available, else fallback
-                hwnd = getattr(self, '_cached_hwnd', self.winfo_id())
-                win_utils.set_layered_attributes(hwnd, self.bg_color, self.alpha)
-                self._last_applied_alpha_int = current_alpha_int
-            except:
-                pass
+                callback()
+            finally:
+                pulse(frames)
+
+        self.scheduler.callback = first_pulse
 
-        speed = self.cfg.get("pulse_speed_ms")
-        self.after(speed, self.pulse)
+    def pulse(self, frames=1):
+        """
+        One animation frame, called by the scheduler. `frames` > 1 means
+        frames were dropped; the waveform skips ahead to stay in rhythm.
+        """
+        self.frame_stats.record_tick(self.scheduler.last_tick_ns)
+
+        # Coalesced move-mode drag: however many motion events arrived
+        if self._drag_target is not None:
+            self.apply_drag()
+
+        # Local lag: escalate at once, clear only after a run of on-time frames
+        lateness = self.scheduler.last_lateness_ns
+        level = 2 if lateness >= self._lag_critical_ns else 1 if lateness >= self._lag_warn_ns else 0
+        if level > self.lag_level:
+            self._lag_calm_frames = 0
+            self.set_lag_level(level)
+        elif level < self.lag_level:
+            self._lag_calm_frames += 1
+            if self._lag_calm_frames >= self.LAG_RECOVERY_FRAMES:
+                self._lag_calm_frames = 0
+                self.set_lag_level(level)
+        else:
+            self._lag_calm_frames = 0
+
+        # Computed once per frame, fanned out to every indicator; each only
+        # calls the Windows API when its visible alpha changes
+        alpha = self.alpha_byte = self.waveform.advance(frames)
+        self.present_frame(alpha)
+        for indicator in self.indicators:
+            indicator.present_frame(alpha)
+
+        # Tray / control commands run here, after the frame is presented
+        self.commands.drain()
+
+    def poll_commands_idle(self):
+        """Drains commands while the animation (and so pulse()) is paused."""
+        self._idle_poll_id = None
+        if self.scheduler.running:
+            return
+        self._loop_alive_ns = self.clock()  # Stands in for the health stamp while paused
+        self.commands.drain()
+        if not self.scheduler.running:
+            self._idle_poll_id = self.after(self.COMMAND_IDLE_POLL_MS, self.poll_commands_idle)
+
+    def set_suspended(self, reason, active):
+        """
+        Pauses the animation while any suspend reason is active (hidden,
+        locked, disconnected, display off...) and resumes once all clear.
+        """
+        if active:
+            self._suspend_reasons.add(reason)
+        else:
+            self._suspend_reasons.discard(reason)
+
+        if self._suspend_reasons and self.scheduler.running:
+            self.scheduler.stop()
+            if self._idle_poll_id is None:
+                self._idle_poll_id = self.after(self.COMMAND_IDLE_POLL_MS, self.poll_commands_idle)
+            logger.info(f"Animation paused ({', '.join(sorted(self._suspend_reasons))})")
+        elif not self._suspend_reasons and not self.scheduler.running:
+            self.frame_stats.mark_gap()
+            self.scheduler.start()
+            logger.info("Animation resumed")
+        self.update_health_stamp()
 
     def show(self):
         self.deiconify()
+        for indicator in self.indicators:
+            indicator.deiconify()
+        self.set_suspended("hidden", False)
         # When showing again, we need to re-apply styles
         self.after(10, self.apply_window_styles)
+        for indicator in self.indicators:
+            self.after(10, indicator.apply_window_styles)
 
     def hide(self):
         self.withdraw()
+        for indicator in self.indicators:
+            indicator.withdraw()
+        self.set_suspended("hidden", True)
+
+    def destroy(self):
+        # Stops the timer chain and releases any timer resolution request
+        self.scheduler.stop()
+        self.stop_profiling()
+        self.session_monitor.stop()
+        for indicator in self.indicators:
+            indicator.destroy()
+        self.indicators = []
+        self.free_surface()
+        super().destroy()
@@ -1,89 +1,49 @@
+import json
 import locale
+import os
+import sys
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 LANGUAGES = {"en": "English", "zh": "中文"}
 
-STRINGS = {
-    "en": {
-        # Tray menu
-        "tray.show": "Show",
-        "tray.hide": "Hide",
-        "tray.move_enable": "Enable Move Mode",
-        "tray.move_disable": "Disable Move Mode",
-        "tray.settings": "Settings",
-        "tray.about": "About",
-        "tray.exit": "Exit",
-
-        # Settings dialog
-        "settings.title": "Settings",
-        "settings.appearance": "APPEARANCE",
-        "settings.dot_color": "Dot Color",
-        "settings.size": "Size",
-        "settings.max_opacity": "Max Opacity",
-        "settings.behavior": "BEHAVIOR",
-        "settings.pulse_speed": "Pulse Speed",
-        "settings.always_on_top": "Always on Top",
-        "settings.position": "Position",
-        "settings.reset_default": "Reset to Default Position",
-        "settings.reset_bottom_right": "Reset to Bottom Right (Default)",
-        "settings.reset_pending": "Position Reset Pending",
-        "settings.restore_defaults": "Restore Defaults",
-        "settings.save": "Save",
-        "settings.cancel": "Cancel",
-        "settings.language": "Language",
-        "settings.auto_start": "Start with Windows",
-        "settings.auto_start_manage": "Manage in Windows Settings →",
-
-        # About dialog
-        "about.title": "About",
-        "about.app_name": "RDP Heartbeat",
-        "about.description": "A visual heartbeat to detect\nsilent RDP freezes and connection drops.",
-        "about.visit_website": "Visit Project Website",
-        "about.close": "Close",
-    },
-    "zh": {
-        # Tray menu
-        "tray.show": "显示",
-        "tray.hide": "隐藏",
-        "tray.move_enable": "拖动模式",
-        "tray.move_disable": "锁定位置",
-        "tray.settings": "设置",
-        "tray.about": "关于",
-        "tray.exit": "退出",
-
-        # Settings dialog
-        "settings.title": "设置",
-        "settings.appearance": "外观",
-        "settings.dot_color": "光点颜色",
-        "settings.size": "大小",
-        "settings.max_opacity": "最大不透明度",
-        "settings.behavior": "行为",
-        "settings.pulse_speed": "脉冲速度",
-        "settings.always_on_top": "始终置顶",
-        "settings.position": "位置",
-        "settings.reset_default": "重置到默认位置",
-        "settings.reset_bottom_right": "重置到右下角（默认）",
-        "settings.reset_pending": "位置重置待生效",
-        "settings.restore_defaults": "恢复默认",
-        "settings.save": "保存",
-        "settings.cancel": "取消",
-        "settings.language": "语言",
-        "settings.auto_start": "开机自启动",
-        "settings.auto_start_manage": "在 Windows 设置中管理 →",
-
-        # About dialog
-        "about.title": "关于",
-        "about.app_name": "RDP Heartbeat",
-        "about.description": "用于检测远程桌面\n连接中断的可视化心跳工具。",
-        "about.visit_website": "访问项目网站",
-        "about.close": "关闭",
-    }
-}
+FALLBACK_LANGUAGE = "en"
+
+# One JSON catalog per language ({key: text}); only the active one (plus the
+# English fallback) is ever read
+LOCALES_DIR = "locales"
 
 _current_lang = "en"
 _config_manager = None
+# Resolved {key: text} for _current_lang with English fallbacks merged in;
+# replaced wholesale (never mutated) so t() always sees a complete catalog
+_strings = None
+
+
+def _locales_path(lang):
+    """Catalog path, inside the PyInstaller bundle when frozen."""
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, LOCALES_DIR, f"{lang}.json")
+
+
+def _read_catalog(lang):
+    try:
+        with open(_locales_path(lang), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load catalog '{lang}': {e}")
+        return {}
+
+
+def _load(lang):
+    """Builds the flattened catalog for `lang` and swaps it in."""
+    global _strings
+    strings = _read_catalog(FALLBACK_LANGUAGE)
+    if lang != FALLBACK_LANGUAGE:
+        strings.update(_read_catalog(lang))
+    _strings = strings
+    return strings
 
 
 def init(config_manager):
@@ -95,6 +55,7 @@ def init(config_manager):
         _current_lang = _detect_system_language()
     else:
         _current_lang = lang
+    _load(_current_lang)
     logger.info(f"Language initialized: {_current_lang}")
 
 
@@ -111,8 +72,10 @@ def _detect_system_language():
 
 def t(key):
     """Translate a string key. Falls back to English, then returns key itself."""
-    lang_strings = STRINGS.get(_current_lang, STRINGS["en"])
-    return lang_strings.get(key, STRINGS["en"].get(key, key))
+    strings = _strings
+    if strings is None:
+        strings = _load(_current_lang)
+    return strings.get(key, key)
 
 
 def get_language():
@@ -125,6 +88,7 @@ def set_language(lang):
     global _current_lang
     if lang in LANGUAGES or lang == "auto":
         _current_lang = lang if lang != "auto" else _detect_system_language()
+        _load(_current_lang)
         if _config_manager:
             _config_manager.set("language", lang)
         logger.info(f"Language changed to: {_current_lang}")
@@ -0,0 +1,199 @@
+import platform
+import tkinter as tk
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MARGIN = 8
+
+
+def anchor_position(work, size, anchor, offset_x=DEFAULT_MARGIN, offset_y=DEFAULT_MARGIN):
+    """
+    Top-left (x, y) of a size x size dot in work area (left, top, right,
+    bottom). Offsets push the dot inwards from the anchored edges; for
+    top_center, offset_x is added to the centre (the RDP connection bar
+    sits there, so e.g. 220 puts the dot just right of it).
+    """
+    left, top, right, bottom = work
+    if anchor == "top_center":
+        x = (left + right - size) // 2 + offset_x
+    elif anchor.endswith("left"):
+        x = left + offset_x
+    else:
+        x = right - size - offset_x
+    if anchor.startswith("top"):
+        y = top + offset_y
+    else:
+        y = bottom - size - offset_y
+    return x, y
+
+
+class DotWindow:
+    """
+    Drawing and presentation shared by the main window and extra
+    indicators. Expects win32, canvas, size, bg_color, per_pixel,
+    _atlas_cache, waveform, move_mode and current_color() on the instance.
+    """
+
+    def init_dot_state(self):
+        self._atlas = None
+        self._surface = None
+        # Track last applied alpha to avoid redundant API calls
+        self._last_applied_alpha_int = -1
+
+    def draw_dot(self):
+        self.canvas.delete("all")
+        if self.per_pixel:
+            # The dot lives in the frame atlas, not on the canvas
+            self.rebuild_atlas()
+            return
+        padding = 1
+        self.oval = self.canvas.create_oval(padding, padding,
+                                            self.size-padding, self.size-padding,
+                                            fill=self.current_color(), outline="")
+
+    def rebuild_atlas(self):
+        """Fetches (or renders) the frame atlas for the current color, size and waveform."""
+        try:
+            atlas = self._atlas_cache.get(self.current_color(), self.size, self.waveform.table)
+            if atlas is self._atlas:
+                return
+            self.free_surface()
+            self._atlas = atlas
+            self._surface = self.win32.create_layered_surface(atlas)
+            self._last_applied_alpha_int = -1  # Force the next frame out
+        except Exception as e:
+            logger.error(f"Error building dot atlas: {e}")
+
+    def free_surface(self):
+        if self._surface is not None:
+            self.win32.free_layered_surface(self._surface)
+            self._surface = None
+
+    def present_alpha(self, hwnd, alpha_byte):
+        """Shows the dot at the given alpha using the active renderer."""
+        if self._surface is not None:
+            self.win32.present_layered_frame(hwnd, self._surface, self._atlas.index[alpha_byte])
+        else:
+            self.win32.set_layered_alpha(hwnd, self.bg_color, alpha_byte)
+
+    def present_frame(self, alpha_byte):
+        """Per-frame entry point: one OS call, and only when the alpha changed."""
+        if alpha_byte != self._last_applied_alpha_int:
+            try:
+                # Use cached HWND if available, else fallback
+                hwnd = getattr(self, '_cached_hwnd', self.winfo_id())
+                self.present_alpha(hwnd, alpha_byte)
+                self._last_applied_alpha_int = alpha_byte
+            except Exception as e:
+                # Rate-limited by the logger, so a persistent failure stays cheap
+                logger.error(f"Error applying pulse frame: {e}")
+
+    def apply_window_styles(self, event=None):
+        """
+        Applies the Windows-specific styles for transparency and click-through.
+        This must be called AFTER the window is mapped by the OS.
+        """
+        try:
+            # Try to get the specific HWND for the top-level window by title
+            # This ensures we get the correct handle even with overrideredirect
+            hwnd = self.win32.find_window_by_title(self.title())
+            if not hwnd:
+                hwnd = self.winfo_id()
+
+            self._cached_hwnd = hwnd
+
+            # 1. Ensure the window has the WS_EX_LAYERED style
+            if self.move_mode:
+                self.win32.remove_click_through(hwnd)
+            else:
+                self.win32.set_click_through(hwnd)
+
+            # 2. Set the transparency key and initial alpha
+            # (or the first atlas frame; SetLayeredWindowAttributes would
+            # block UpdateLayeredWindow on the same window)
+            self.present_alpha(hwnd, self.alpha_byte)
+            self._last_applied_alpha_int = self.alpha_byte
+        except Exception as e:
+            logger.error(f"Error setting window styles: {e}")
+
+
+class Indicator(DotWindow, tk.Toplevel):
+    """
+    An extra, click-through dot owned by the main window. It has no timer
+    of its own: the main window's scheduler computes the alpha once per
+    frame and hands it to present_frame() of every indicator.
+
+    spec keys (all optional): monitor, anchor, offset_x, offset_y, color, size.
+    """
+
+    # Swapped for a fake by the headless simulation (simulation.py)
+    canvas_class = tk.Canvas
+
+    move_mode = False  # Only the main dot can be dragged
+
+    def __init__(self, root, index, spec):
+        super().__init__(root)
+        self.root = root
+        self.win32 = root.win32
+        self.bg_color = root.bg_color
+        self.per_pixel = root.per_pixel
+        self._atlas_cache = root._atlas_cache
+        self.waveform = root.waveform
+        self.init_dot_state()
+        try:
+            # Unique title, so apply_window_styles finds this window's HWND
+            self.title(f"RDP Heartbeat {index + 1}")
+            self.overrideredirect(True)
+            self.attributes("-topmost", root.cfg.snapshot.always_on_top)
+            if platform.system() == "Windows":
+                self.attributes("-toolwindow", True)  # Hide from taskbar
+            self.config(bg=self.bg_color)
+
+            self.spec = {}
+            self.color = root.dot_color
+            self.size = root.size
+            self.canvas = self.canvas_class(self, width=self.size, height=self.size,
+                                            bg=self.bg_color, highlightthickness=0)
+            self.canvas.pack(fill=tk.BOTH, expand=True)
+            self.bind("<Map>", self.apply_window_styles)
+            self.apply_spec(spec)
+        except Exception:
+            # The Toplevel already exists; don't leave a blank window on
+            # screen. The caller (sync_indicators) logs the error.
+            self.destroy()
+            raise
+
+    @property
+    def alpha_byte(self):
+        return self.root.alpha_byte
+
+    def current_color(self):
+        """Own color, or the shared lag color while the event loop is late."""
+        return self.root._lag_colors[self.root.lag_level] or self.color
+
+    def apply_spec(self, spec):
+        """(Re)applies color, size and position; inherits unset values from the main dot."""
+        self.spec = dict(spec)
+        self.color = spec.get("color") or self.root.dot_color
+        self.size = int(spec.get("size") or self.root.size)
+        self.canvas.config(width=self.size, height=self.size)
+        self.update_position()
+        self.draw_dot()
+
+    def update_position(self):
+        topology = self.root.topology
+        monitor = topology.by_name(self.spec.get("monitor")) or topology.primary()
+        if monitor is not None:
+            work = monitor.work
+        else:
+            work = (0, 0, self.winfo_screenwidth(), self.winfo_screenheight())
+        # Specs are validated by ConfigSnapshot: anchor is one of config_manager.ANCHORS
+        x, y = anchor_position(work, self.size, self.spec.get("anchor", "bottom_right"),
+                               self.spec.get("offset_x", DEFAULT_MARGIN),
+                               self.spec.get("offset_y", DEFAULT_MARGIN))
+        self.geometry(f"{self.size}x{self.size}+{x}+{y}")
+
+    def destroy(self):
+        self.free_surface()
+        super().destroy()
@@ -1,7 +1,11 @@
+import atexit
 import logging
 import os
 import platform
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 
 def _get_log_dir():
@@ -15,20 +19,106 @@ def _get_log_dir():
     return log_dir
 
 
-def get_logger(name):
+# One queue and one background listener for the whole process. Loggers only
+# enqueue records; the listener thread owns the single rotating file handle,
+# so no caller (including the Tk thread in pulse()) blocks on disk.
+_queue_handler = None
+_listener = None
+_rate_limit = None
+_setup_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
     """
-    Get a configured logger instance.
-    Uses RotatingFileHandler: max 1MB per file, 3 backups.
+    Token-bucket limit per call site and message for WARNING and above. A
+    failing hot path (e.g. a Win32 call on every pulse tick) gets BURST
+    records through, then one per REFILL_S; the ones dropped in between are
+    reported as "[repeated N times ...]" on the next record that passes, or
+    at shutdown. INFO and DEBUG always pass. Runs on the caller's thread
+    (whichever thread logs) before the record is enqueued, so a dropped
+    record never reaches the queue; the buckets are shared across threads
+    and only touched under self._lock.
+    `sink(record)` receives the summaries of buckets evicted at MAX_KEYS.
     """
-    logger = logging.getLogger(name)
-    if logger.handlers:
-        return logger  # Already configured
 
-    logger.setLevel(logging.DEBUG)
+    BURST = 3
+    REFILL_S = 30.0
+    MIN_LEVEL = logging.WARNING
+    MAX_KEYS = 1000  # Bound memory if messages carry varying data
+
+    def __init__(self, sink=None):
+        super().__init__()
+        self.sink = sink
+        self._lock = threading.Lock()
+        self._buckets = {}  # key -> [tokens, last_refill, suppressed, first_suppressed_at, last_record]
+
+    def filter(self, record):
+        if record.levelno < self.MIN_LEVEL:
+            return True
+        key = (record.pathname, record.lineno, record.msg)
+        now = time.monotonic()
+        evicted = ()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_KEYS:
+                    # Don't lose the counts of what was suppressed so far
+                    evicted = self._take_summaries(now)
+                    self._buckets.clear()
+                bucket = [self.BURST, now, 0, 0.0, None]
+                self._buckets[key] = bucket
+            else:
+                tokens = bucket[0] + (now - bucket[1]) / self.REFILL_S
+                bucket[0] = tokens if tokens < self.BURST else self.BURST
+                bucket[1] = now
+
+            if bucket[0] < 1:
+                if not bucket[2]:
+                    bucket[3] = now
+                bucket[2] += 1
+                bucket[4] = record
+                return False
+
+            bucket[0] -= 1
+            suppressed, since = bucket[2], bucket[3]
+            bucket[2] = 0
+            bucket[4] = None
+
+        if evicted and self.sink is not None:
+            for summary in evicted:
+                self.sink(summary)
+        if suppressed:
+            record.msg = f"{record.getMessage()} [repeated {suppressed} times in {now - since:.0f}s]"
+            record.args = None
+        return True
+
+    def pending_summaries(self):
+        """Returns records summarizing messages still suppressed (for shutdown)."""
+        with self._lock:
+            return self._take_summaries(time.monotonic())
+
+    def _take_summaries(self, now):
+        """Summary records for all suppressed messages, resetting their counts. Lock held."""
+        records = []
+        for bucket in self._buckets.values():
+            record = bucket[4]
+            if record is None or not bucket[2]:
+                continue
+            record.msg = f"{record.getMessage()} [repeated {bucket[2]} times in {now - bucket[3]:.0f}s]"
+            record.args = None
+            records.append(record)
+            bucket[2] = 0
+            bucket[4] = None
+        return records
+
+
+def _start_listener():
+    global _queue_handler, _listener, _rate_limit
     formatter = logging.Formatter(
         "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S"
     )
+    handlers = []
 
     # File handler
     try:
@@ -38,7 +128,7 @@ def get_logger(name):
         )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except Exception:
         pass  # Fail silently if log dir is not writable
 
@@ -46,6 +136,43 @@ def get_logger(name):
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
+
+    log_queue = queue.Queue(-1)  # Unbounded: enqueueing never blocks
+    _queue_handler = QueueHandler(log_queue)
+    _rate_limit = RateLimitFilter(sink=log_queue.put_nowait)
+    _queue_handler.addFilter(_rate_limit)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown)
+
+
+def shutdown():
+    """Flushes queued records to disk and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        for record in _rate_limit.pending_summaries():
+            _listener.queue.put_nowait(record)
+        _listener.stop()  # Processes everything still queued before returning
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
+
+def get_logger(name):
+    """
+    Get a configured logger instance.
+    Records go through a shared QueueHandler to a background thread that
+    writes rdp_heartbeat.log (RotatingFileHandler: max 1MB per file, 3 backups).
+    """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger  # Already configured
+
+    with _setup_lock:
+        if _queue_handler is None:
+            _start_listener()
+
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(_queue_handler)
     return logger
@@ -1,21 +1,93 @@
+import time
+_START = time.perf_counter()  # Before any heavy imports, for startup phase timing
+
+import argparse
+import re
 import sys
 import threading
-import tkinter as tk
 import win_utils
-from heartbeat_window import BreatheWindow
-from tray_icon import start_tray
-from settings_dialog import SettingsDialog
-from about_dialog import AboutDialog
 from version import APP_VERSION
-from logger import get_logger
+from logger import get_logger, shutdown as shutdown_logging
 import i18n
+import command_queue as commands
 from config_manager import ConfigManager
+from startup_marker import FIRST_PULSE_MARKER
+
+# Deferred until first use to keep time-to-first-pulse low:
+#   settings_dialog / about_dialog  (customtkinter + theme setup)
+#   tray_icon                       (pystray + PIL, loaded on the tray thread)
+#   heartbeat_window                (tkinter; a second launch only forwards its arguments)
 
 logger = get_logger(__name__)
 
+
+def _color_arg(text):
+    if not re.fullmatch(r"#[0-9A-Fa-f]{6}", text):
+        raise argparse.ArgumentTypeError(f"expected #RRGGBB, got {text!r}")
+    return text.upper()
+
+
+def _profile_seconds_arg(text):
+    import math
+    from profiler import clamp_duration
+    try:
+        seconds = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected seconds, got {text!r}")
+    if not math.isfinite(seconds) or seconds <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive number of seconds, got {text!r}")
+    return clamp_duration(seconds)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="RDPHeartbeat")
+    parser.add_argument("--fake-win32", action="store_true",
+                        help="Use the in-memory window backend instead of user32")
+    parser.add_argument("--fake-tray", action="store_true",
+                        help="Run without a system tray icon")
+    parser.add_argument("--exit-after-first-pulse", action="store_true",
+                        help=f"Print {FIRST_PULSE_MARKER} on the first pulse and exit (startup benchmark)")
+    # Control commands; a second launch forwards these to the running instance
+    parser.add_argument("--show", action="store_true", help="Show the dot")
+    parser.add_argument("--hide", action="store_true", help="Hide the dot")
+    parser.add_argument("--color", type=_color_arg, metavar="#RRGGBB", help="Set the dot color")
+    parser.add_argument("--move", type=int, nargs=2, metavar=("X", "Y"), help="Move the dot to screen coordinates")
+    parser.add_argument("--profile", type=_profile_seconds_arg, nargs="?", const=0, metavar="SECONDS",
+                        help="Run cProfile + tracemalloc for SECONDS (default 30, at most 600), "
+                             "reports go to the log folder")
+    # parse_known_args: ignore unrelated arguments (e.g. from shortcuts)
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+class StartupTimer:
+    """Collects the duration of each startup phase for a single log line."""
+
+    def __init__(self, start):
+        self.start = start
+        self.last = start
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self):
+        total = (self.last - self.start) * 1000
+        parts = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.phases)
+        logger.info(f"Startup: {parts} (total {total:.0f} ms)")
+
+
 def main():
+    timer = StartupTimer(_START)
+    timer.mark("imports")
+    args = parse_args()
     logger.info(f"RDP Heartbeat v{APP_VERSION} starting...")
 
+    if args.fake_win32:
+        win_utils.set_backend(win_utils.FakeBackend())
+
     # Set DPI awareness as early as possible (before Tk initialization)
     win_utils.set_dpi_awareness()
 
@@ -23,57 +95,139 @@ def main():
     # We use a Global mutex to ensure it works across sessions if needed,
     # though "Local\" is safer for per-user session.
     # For a heartbeat tool, per-user is likely what we want.
+    # A startup benchmark run is a throwaway instance: it must start fully
+    # even if the user's heartbeat is running, and never forward to it.
+    benchmark = args.exit_after_first_pulse
     mutex_name = "Local\\RDPHeartbeatInstance"
-    mutex = win_utils.create_single_instance_mutex(mutex_name)
-    if mutex is None:
-        # Another instance is running
-        logger.warning("Another instance is already running. Exiting.")
+    mutex = None if benchmark else win_utils.create_single_instance_mutex(mutex_name)
+    if mutex is None and not benchmark:
+        # Another instance is running: hand our arguments to it instead of starting
+        from control_channel import send_command
+        reply = send_command(sys.argv[1:])
+        if reply is None:
+            logger.warning("Another instance is already running but did not answer. Exiting.")
+            sys.exit(1)
+        if not reply.get("ok"):
+            logger.error(f"Running instance rejected {sys.argv[1:]}: {reply.get('error')}")
+            sys.exit(1)
+        logger.info(f"Forwarded {sys.argv[1:]} to the running instance. Exiting.")
         sys.exit(0)
 
+    timer.mark("dpi+mutex")
+
+    # Decode the tray icon while Tk creates the window
+    tray_icon_image = {}
+
+    def load_tray_icon():
+        if args.fake_tray:
+            return
+        try:
+            from tray_icon import create_icon
+            image = create_icon()
+            image.load()  # Image.open is lazy; decode here, not on first paint
+            tray_icon_image["image"] = image
+        except Exception as e:
+            logger.error(f"Error preloading tray icon: {e}")
+
+    icon_thread = threading.Thread(target=load_tray_icon, daemon=True)
+    icon_thread.start()
+
     # 1. Initialize i18n (before GUI creation)
     config_mgr = ConfigManager()
     i18n.init(config_mgr)
+    timer.mark("config+i18n")
 
     # 2. Create the GUI on the Main Thread
+    from heartbeat_window import BreatheWindow
     app = BreatheWindow(config_mgr)
-
-    # Thread-safe callbacks for the tray icon
-    # Tkinter requires GUI updates to happen on the main thread
-    # We use app.after(0, callback) to schedule them from the tray thread
-
-    def safe_show():
-        app.after(0, app.show)
-
-    def safe_hide():
-        app.after(0, app.hide)
-
-    def safe_toggle_move():
-        app.after(0, app.toggle_move_mode)
-
-    def safe_open_settings():
-        def open_settings_dialog():
-            # Only open if not already open (basic check, can be improved)
-            # For now, just create a new dialog
-            dialog = SettingsDialog(app, app.config_manager)
-            dialog.focus_force()
-
-        app.after(0, open_settings_dialog)
-
-    def safe_open_about():
-        def open_about_dialog():
-            dialog = AboutDialog(app)
-            dialog.focus_force()
-        app.after(0, open_about_dialog)
-
-    def safe_exit():
-        app.after(0, app.destroy)
+    timer.mark("window")
+
+    def on_first_pulse():
+        timer.mark("first pulse")
+        timer.report()
+        if args.exit_after_first_pulse:
+            if sys.stdout:
+                print(f"{FIRST_PULSE_MARKER} {(timer.last - timer.start) * 1000:.1f}", flush=True)
+            app.after(0, app.destroy)
+
+    app.call_on_first_pulse(on_first_pulse)
+
+    # Tray and control-endpoint threads never call Tk. They enqueue typed
+    # commands on app.commands, which the Tk loop drains once per frame.
+
+    def open_settings_dialog(payload):
+        # Only open if not already open (basic check, can be improved)
+        # For now, just create a new dialog
+        from settings_dialog import SettingsDialog
+        dialog = SettingsDialog(app, app.config_manager)
+        dialog.focus_force()
+
+    def open_about_dialog(payload):
+        from about_dialog import AboutDialog
+        dialog = AboutDialog(app)
+        dialog.focus_force()
+
+    def apply_control_args(control):
+        """Applies --color/--move/--show/--hide. Runs on the Tk thread."""
+        if control.color:
+            config_mgr.set("dot_color", control.color)
+        if control.move:
+            with config_mgr.batch():
+                config_mgr.set("window_x", control.move[0])
+                config_mgr.set("window_y", control.move[1])
+                config_mgr.set("window_monitor", None)
+        if control.profile is not None:
+            app.start_profiling(control.profile)
+        if control.hide:
+            app.hide()
+        elif control.show or not (control.color or control.move or control.profile is not None):
+            # A bare relaunch brings the dot back
+            app.show()
+
+    app.commands.register(commands.OPEN_SETTINGS, open_settings_dialog)
+    app.commands.register(commands.OPEN_ABOUT, open_about_dialog)
+    app.commands.register(commands.APPLY_CONTROL, apply_control_args)
+
+    def handle_control(argv):
+        """Control endpoint handler (server thread); raises on bad arguments."""
+        try:
+            control = parse_args(argv)
+        except SystemExit:
+            raise ValueError(f"invalid arguments: {argv}")
+        if not app.commands.put(commands.APPLY_CONTROL, control):
+            raise RuntimeError("command queue full")
+
+    # Local control endpoint for later launches and scripts (not for a
+    # benchmark run, which would take the endpoint over from the real instance)
+    from control_channel import ControlServer
+    control_server = ControlServer(handle_control)
+    if not benchmark:
+        control_server.start()
+    if args.color or args.move or args.hide or args.profile is not None:
+        app.commands.put(commands.APPLY_CONTROL, args)
 
     # 2. Start the System Tray in a Background Thread
     # pystray blocks its calling thread, so we must use a separate thread
     # to let Tkinter's mainloop run on the main thread.
     def run_tray():
-        tray = start_tray(safe_show, safe_hide, safe_toggle_move, safe_open_settings, safe_open_about, safe_exit)
+        icon_thread.join()
+        from tray_icon import start_tray
+        put = app.commands.put
+        tray = start_tray(lambda: put(commands.SHOW), lambda: put(commands.HIDE),
+                          lambda: put(commands.TOGGLE_MOVE), lambda: put(commands.OPEN_SETTINGS),
+                          lambda: put(commands.OPEN_ABOUT), lambda: put(commands.EXIT),
+                          on_profile=lambda: put(commands.PROFILE),
+                          get_frame_stats=app.frame_stats.format_summary,
+                          icon_image=tray_icon_image.get("image"),
+                          get_health=app.health,
+                          status_enabled=config_mgr.snapshot.tray_status_icon,
+                          status_interval_ms=config_mgr.snapshot.tray_status_interval_ms,
+                          fake=args.fake_tray)
         app.tray_controller = tray  # Store for settings dialog to trigger menu refresh
+        # Follow the status icon settings; the tray worker only wakes periodically while it's on
+        config_mgr.subscribe(("tray_status_icon", "tray_status_interval_ms"),
+                             lambda changed: tray.set_status_options(config_mgr.snapshot.tray_status_icon,
+                                                                     config_mgr.snapshot.tray_status_interval_ms))
         tray.run()
 
     tray_thread = threading.Thread(target=run_tray, daemon=True)
@@ -84,6 +238,12 @@ def main():
         app.mainloop()
     except KeyboardInterrupt:
         app.destroy()
+    finally:
+        control_server.stop()
+        # Write out any debounced config changes before the process exits
+        config_mgr.flush()
+        # Drain the log queue to disk
+        shutdown_logging()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,106 @@
+import ctypes
+import platform
+from collections import namedtuple
+from ctypes import wintypes
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+MONITORINFOF_PRIMARY = 0x1
+
+# rect / work are (left, top, right, bottom); work excludes taskbars
+Monitor = namedtuple("Monitor", ["name", "rect", "work", "primary"])
+
+
+class MonitorTopology:
+    """
+    Cached list of monitors. Built from a provider on refresh() only (i.e. on
+    display-change and work-area-change notifications), never on demand.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.monitors = []
+        self._by_name = {}
+        self._primary = None
+        self.refresh()
+
+    def refresh(self):
+        try:
+            monitors = list(self.provider.enumerate())
+        except Exception as e:
+            logger.error(f"Failed to enumerate monitors: {e}")
+            monitors = []
+        self.monitors = monitors
+        self._by_name = {m.name: m for m in monitors}
+        self._primary = next((m for m in monitors if m.primary), monitors[0] if monitors else None)
+        logger.info(f"Monitor topology: {[(m.name, m.work) for m in monitors]}")
+
+    def primary(self):
+        return self._primary
+
+    def by_name(self, name):
+        return self._by_name.get(name)
+
+    def monitor_for_point(self, x, y):
+        """Monitor containing (x, y), or None."""
+        for m in self.monitors:
+            left, top, right, bottom = m.rect
+            if left <= x < right and top <= y < bottom:
+                return m
+        return None
+
+
+class FakeMonitorProvider:
+    """Returns a fixed list of Monitor tuples (tests, non-Windows)."""
+
+    def __init__(self, monitors=()):
+        self.monitors = list(monitors)
+
+    def enumerate(self):
+        return list(self.monitors)
+
+
+class _MONITORINFOEXW(ctypes.Structure):
+    _fields_ = [("cbSize", wintypes.DWORD), ("rcMonitor", wintypes.RECT), ("rcWork", wintypes.RECT),
+                ("dwFlags", wintypes.DWORD), ("szDevice", wintypes.WCHAR * 32)]
+
+
+class Win32MonitorProvider:
+    """Enumerates monitors with EnumDisplayMonitors / GetMonitorInfoW."""
+
+    def __init__(self):
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        self._MONITORENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HMONITOR, wintypes.HDC,
+                                                   ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
+        self._EnumDisplayMonitors = user32.EnumDisplayMonitors
+        self._EnumDisplayMonitors.argtypes = (wintypes.HDC, ctypes.POINTER(wintypes.RECT),
+                                              self._MONITORENUMPROC, wintypes.LPARAM)
+        self._EnumDisplayMonitors.restype = wintypes.BOOL
+        self._GetMonitorInfoW = user32.GetMonitorInfoW
+        self._GetMonitorInfoW.argtypes = (wintypes.HMONITOR, ctypes.POINTER(_MONITORINFOEXW))
+        self._GetMonitorInfoW.restype = wintypes.BOOL
+
+    def enumerate(self):
+        monitors = []
+
+        def callback(hmonitor, hdc, rect, lparam):
+            info = _MONITORINFOEXW()
+            info.cbSize = ctypes.sizeof(_MONITORINFOEXW)
+            if self._GetMonitorInfoW(hmonitor, ctypes.byref(info)):
+                r, w = info.rcMonitor, info.rcWork
+                monitors.append(Monitor(info.szDevice,
+                                        (r.left, r.top, r.right, r.bottom),
+                                        (w.left, w.top, w.right, w.bottom),
+                                        bool(info.dwFlags & MONITORINFOF_PRIMARY)))
+            return True
+
+        self._EnumDisplayMonitors(None, None, self._MONITORENUMPROC(callback), 0)
+        return monitors
+
+
+def create_monitor_provider():
+    """Win32 provider on Windows; an empty fake elsewhere (callers use Tk's screen size)."""
+    if platform.system() == "Windows":
+        return Win32MonitorProvider()
+    return FakeMonitorProvider()
@@ -0,0 +1,142 @@
+"""
+On-demand profiling for "the dot stutters" reports.
+
+A ProfilingSession runs cProfile (on the thread that starts it, i.e. the
+Tk loop that drives pulse()) and tracemalloc for a bounded window, then
+writes to the log directory:
+
+    profile_<time>.txt    pstats, top entries by cumulative and own time
+    profile_<time>.prof   raw stats (snakeviz, pstats.Stats)
+    alloc_<time>.txt      top-N allocation growth over the window, plus
+                          the net growth on the pulse() path per tick
+"""
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from logger import get_logger, _get_log_dir
+
+logger = get_logger(__name__)
+
+DEFAULT_DURATION_S = 30
+# Bounds for a requested duration, so a typo can't leave profiling on for days
+MIN_DURATION_S = 1
+MAX_DURATION_S = 600
+TOP_N = 25
+
+
+def clamp_duration(duration_s):
+    """Requested seconds clamped to [MIN_DURATION_S, MAX_DURATION_S]; None or 0 means the default."""
+    if not duration_s:
+        return DEFAULT_DURATION_S
+    return max(MIN_DURATION_S, min(MAX_DURATION_S, duration_s))
+
+
+# Modules that run on every tick; their net allocation should be zero
+PULSE_PATH_FILES = ("heartbeat_window.py", "indicator.py", "waveform.py", "frame_scheduler.py",
+                    "frame_stats.py", "command_queue.py", "win_utils.py")
+
+
+class ProfilingSession:
+    def __init__(self, duration_s=DEFAULT_DURATION_S, top_n=TOP_N, log_dir=None):
+        self.duration_s = duration_s
+        self.top_n = top_n
+        self.log_dir = log_dir
+        self.running = False
+        self._profile = None
+        self._before = None
+        self._started_tracing = False
+        self._start_time = None
+
+    def start(self):
+        """Starts both tracers; on failure, stops whatever was started and re-raises."""
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()  # One frame: the diff is grouped by allocating line
+        try:
+            self._before = tracemalloc.take_snapshot()
+            self._profile = cProfile.Profile()
+            self._start_time = time.perf_counter()
+            self._profile.enable()  # Raises if another profiler is active
+        except Exception:
+            self._profile = None
+            self._before = None
+            if self._started_tracing:
+                tracemalloc.stop()
+            raise
+        self.running = True
+
+    def stop(self, ticks=None):
+        """
+        Stops profiling and writes the reports. `ticks` is the number of
+        pulse frames run during the window, for the per-tick figure.
+        Returns the paths written.
+        """
+        if not self.running:
+            return []
+        self._profile.disable()
+        self.running = False
+        elapsed = time.perf_counter() - self._start_time
+        after = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        log_dir = self.log_dir or _get_log_dir()
+        profile_txt = os.path.join(log_dir, f"profile_{stamp}.txt")
+        profile_raw = os.path.join(log_dir, f"profile_{stamp}.prof")
+        alloc_txt = os.path.join(log_dir, f"alloc_{stamp}.txt")
+
+        self._profile.dump_stats(profile_raw)
+        with open(profile_txt, "w", encoding="utf-8") as f:
+            f.write(f"Profiled {elapsed:.1f} s, {ticks if ticks is not None else '?'} pulse ticks\n\n")
+            f.write(self.format_stats())
+
+        summary = self.write_allocations(alloc_txt, after, elapsed, ticks)
+        logger.info(f"Profiling finished after {elapsed:.1f} s: {summary}; reports in {log_dir}")
+        self._profile = None
+        self._before = None
+        return [profile_txt, profile_raw, alloc_txt]
+
+    def format_stats(self):
+        out = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=out)
+        stats.strip_dirs()
+        out.write("=== By cumulative time ===\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        out.write("\n=== By own time ===\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top_n)
+        return out.getvalue()
+
+    def write_allocations(self, path, after, elapsed, ticks):
+        """Writes the allocation diff; returns a one-line summary of the pulse path."""
+        # Leave out the measurement's own allocations
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+                   tracemalloc.Filter(False, cProfile.__file__),
+                   tracemalloc.Filter(False, __file__)]
+        before = self._before.filter_traces(filters)
+        after = after.filter_traces(filters)
+        diff = after.compare_to(before, "lineno")
+
+        pulse_blocks = pulse_bytes = 0
+        for stat in diff:
+            filename = stat.traceback[0].filename
+            if os.path.basename(filename) in PULSE_PATH_FILES:
+                pulse_blocks += stat.count_diff
+                pulse_bytes += stat.size_diff
+        per_tick = f"{pulse_bytes / ticks:.2f} B/tick" if ticks else "n/a per tick"
+        summary = f"pulse path net {pulse_blocks:+d} blocks / {pulse_bytes:+d} B ({per_tick})"
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Allocation growth over {elapsed:.1f} s, {ticks if ticks is not None else '?'} pulse ticks\n")
+            f.write(f"{summary}\n\n")
+            f.write(f"=== Top {self.top_n} by size growth ===\n")
+            for stat in diff[:self.top_n]:
+                f.write(f"{stat}\n")
+            f.write(f"\n=== Pulse path ({', '.join(PULSE_PATH_FILES)}) ===\n")
+            for stat in diff:
+                if os.path.basename(stat.traceback[0].filename) in PULSE_PATH_FILES and stat.count_diff:
+                    f.write(f"{stat}\n")
+        return summary
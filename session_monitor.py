@@ -0,0 +1,263 @@
+import ctypes
+import platform
+import threading
+from ctypes import wintypes
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# Session change notifications (wParam of WM_WTSSESSION_CHANGE)
+WM_WTSSESSION_CHANGE = 0x02B1
+WTS_CONSOLE_CONNECT = 0x1
+WTS_CONSOLE_DISCONNECT = 0x2
+WTS_REMOTE_CONNECT = 0x3
+WTS_REMOTE_DISCONNECT = 0x4
+WTS_SESSION_LOCK = 0x7
+WTS_SESSION_UNLOCK = 0x8
+NOTIFY_FOR_THIS_SESSION = 0
+
+# Power broadcasts
+WM_POWERBROADCAST = 0x0218
+PBT_APMSUSPEND = 0x0004
+PBT_APMRESUMEAUTOMATIC = 0x0012
+PBT_POWERSETTINGCHANGE = 0x8013
+DEVICE_NOTIFY_WINDOW_HANDLE = 0
+
+# Display topology / work area changes
+WM_DISPLAYCHANGE = 0x007E
+WM_SETTINGCHANGE = 0x001A
+SPI_SETWORKAREA = 0x002F
+
+WM_CLOSE = 0x0010
+WM_DESTROY = 0x0002
+
+# Reasons the animation can be suspended for
+LOCKED = "locked"
+DISCONNECTED = "disconnected"
+DISPLAY_OFF = "display_off"
+SUSPENDED = "suspended"
+
+
+class SessionMonitor:
+    """
+    Tracks why the dot can't be seen right now (locked workstation,
+    disconnected session, display off, system suspend).
+
+    Listeners are called as callback(reason, active) from whichever thread
+    the event source runs on; `active` True means the condition started.
+    Display listeners are called with no arguments when the monitor layout
+    or work area may have changed (including session reconnects).
+    """
+
+    def __init__(self):
+        self.inactive_reasons = set()
+        self._listeners = []
+        self._display_listeners = []
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def add_display_listener(self, callback):
+        self._display_listeners.append(callback)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def _set(self, reason, active):
+        if active == (reason in self.inactive_reasons):
+            return
+        if active:
+            self.inactive_reasons.add(reason)
+        else:
+            self.inactive_reasons.discard(reason)
+        logger.info(f"Session state: {reason} {'on' if active else 'off'}")
+        for callback in list(self._listeners):
+            try:
+                callback(reason, active)
+            except Exception as e:
+                logger.error(f"Error in session listener: {e}")
+
+    def _display_changed(self):
+        for callback in list(self._display_listeners):
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in display listener: {e}")
+
+
+class FakeSessionMonitor(SessionMonitor):
+    """Event source driven by hand, for tests and non-Windows platforms."""
+
+    def set_locked(self, locked):
+        self._set(LOCKED, locked)
+
+    def set_disconnected(self, disconnected):
+        self._set(DISCONNECTED, disconnected)
+
+    def set_display_off(self, off):
+        self._set(DISPLAY_OFF, off)
+
+    def set_suspended(self, suspended):
+        self._set(SUSPENDED, suspended)
+
+    def fire_display_change(self):
+        self._display_changed()
+
+
+class _GUID(ctypes.Structure):
+    _fields_ = [("Data1", wintypes.DWORD), ("Data2", wintypes.WORD),
+                ("Data3", wintypes.WORD), ("Data4", ctypes.c_ubyte * 8)]
+
+
+# {6FE69556-704A-47A0-8F24-C28D936FDA47}
+GUID_CONSOLE_DISPLAY_STATE = _GUID(0x6FE69556, 0x704A, 0x47A0,
+                                   (ctypes.c_ubyte * 8)(0x8F, 0x24, 0xC2, 0x8D, 0x93, 0x6F, 0xDA, 0x47))
+
+
+class _POWERBROADCAST_SETTING(ctypes.Structure):
+    _fields_ = [("PowerSetting", _GUID), ("DataLength", wintypes.DWORD),
+                ("Data", ctypes.c_ubyte * 1)]
+
+
+class WindowsSessionMonitor(SessionMonitor):
+    """
+    Receives WTS session notifications, power broadcasts and display /
+    work-area changes on a hidden window owned by a background thread with
+    its own message loop.
+    """
+
+    CLASS_NAME = "RDPHeartbeatSessionMonitor"
+
+    def __init__(self):
+        super().__init__()
+        self._thread = None
+        self._hwnd = None
+        self._ready = threading.Event()
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name="SessionMonitor", daemon=True)
+        self._thread.start()
+        self._ready.wait(2.0)
+
+    def stop(self):
+        if self._hwnd:
+            ctypes.windll.user32.PostMessageW(self._hwnd, WM_CLOSE, 0, 0)
+
+    def _run(self):
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        wtsapi32 = ctypes.WinDLL("wtsapi32", use_last_error=True)
+        kernel32 = ctypes.windll.kernel32
+
+        LRESULT = wintypes.LPARAM
+        WNDPROC = ctypes.WINFUNCTYPE(LRESULT, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+
+        class WNDCLASSW(ctypes.Structure):
+            _fields_ = [("style", wintypes.UINT), ("lpfnWndProc", WNDPROC),
+                        ("cbClsExtra", ctypes.c_int), ("cbWndExtra", ctypes.c_int),
+                        ("hInstance", wintypes.HINSTANCE), ("hIcon", wintypes.HICON),
+                        ("hCursor", wintypes.HANDLE), ("hbrBackground", wintypes.HBRUSH),
+                        ("lpszMenuName", wintypes.LPCWSTR), ("lpszClassName", wintypes.LPCWSTR)]
+
+        user32.DefWindowProcW.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+        user32.DefWindowProcW.restype = LRESULT
+        user32.CreateWindowExW.argtypes = (wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+                                           ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                           wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID)
+        user32.CreateWindowExW.restype = wintypes.HWND
+        user32.RegisterPowerSettingNotification.argtypes = (wintypes.HANDLE, ctypes.POINTER(_GUID), wintypes.DWORD)
+        user32.RegisterPowerSettingNotification.restype = wintypes.HANDLE
+        user32.UnregisterPowerSettingNotification.argtypes = (wintypes.HANDLE,)
+
+        def wnd_proc(hwnd, msg, wparam, lparam):
+            try:
+                if msg == WM_WTSSESSION_CHANGE:
+                    self._on_session_change(wparam)
+                    return 0
+                if msg == WM_DISPLAYCHANGE or (msg == WM_SETTINGCHANGE and wparam == SPI_SETWORKAREA):
+                    self._display_changed()
+                    return 0
+                if msg == WM_POWERBROADCAST:
+                    self._on_power_broadcast(wparam, lparam)
+                    return 1
+                if msg == WM_DESTROY:
+                    user32.PostQuitMessage(0)
+                    return 0
+            except Exception as e:
+                logger.error(f"Session monitor error: {e}")
+            return user32.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+        # Keep the callback alive for the lifetime of the window
+        self._wnd_proc = WNDPROC(wnd_proc)
+        hinstance = kernel32.GetModuleHandleW(None)
+        wc = WNDCLASSW()
+        wc.lpfnWndProc = self._wnd_proc
+        wc.hInstance = hinstance
+        wc.lpszClassName = self.CLASS_NAME
+
+        power_handle = None
+        try:
+            user32.RegisterClassW(ctypes.byref(wc))
+            # A hidden top-level window: message-only windows miss some broadcasts
+            hwnd = user32.CreateWindowExW(0, self.CLASS_NAME, self.CLASS_NAME, 0,
+                                          0, 0, 0, 0, None, None, hinstance, None)
+            if not hwnd:
+                raise ctypes.WinError(ctypes.get_last_error())
+            self._hwnd = hwnd
+
+            if not wtsapi32.WTSRegisterSessionNotification(hwnd, NOTIFY_FOR_THIS_SESSION):
+                logger.warning("WTSRegisterSessionNotification failed")
+            power_handle = user32.RegisterPowerSettingNotification(
+                hwnd, ctypes.byref(GUID_CONSOLE_DISPLAY_STATE), DEVICE_NOTIFY_WINDOW_HANDLE)
+        except Exception as e:
+            logger.error(f"Failed to start session monitor: {e}")
+            self._ready.set()
+            return
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        try:
+            wtsapi32.WTSUnRegisterSessionNotification(self._hwnd)
+            if power_handle:
+                user32.UnregisterPowerSettingNotification(power_handle)
+        except Exception:
+            pass
+        self._hwnd = None
+
+    def _on_session_change(self, event):
+        if event == WTS_SESSION_LOCK:
+            self._set(LOCKED, True)
+        elif event == WTS_SESSION_UNLOCK:
+            self._set(LOCKED, False)
+        elif event in (WTS_REMOTE_DISCONNECT, WTS_CONSOLE_DISCONNECT):
+            self._set(DISCONNECTED, True)
+        elif event in (WTS_REMOTE_CONNECT, WTS_CONSOLE_CONNECT):
+            self._set(DISCONNECTED, False)
+            # A reconnect can come with a different monitor layout
+            self._display_changed()
+
+    def _on_power_broadcast(self, event, lparam):
+        if event == PBT_APMSUSPEND:
+            self._set(SUSPENDED, True)
+        elif event == PBT_APMRESUMEAUTOMATIC:
+            self._set(SUSPENDED, False)
+        elif event == PBT_POWERSETTINGCHANGE and lparam:
+            setting = ctypes.cast(lparam, ctypes.POINTER(_POWERBROADCAST_SETTING)).contents
+            if bytes(setting.PowerSetting) == bytes(GUID_CONSOLE_DISPLAY_STATE):
+                # 0 = off, 1 = on, 2 = dimmed
+                self._set(DISPLAY_OFF, setting.Data[0] == 0)
+
+
+def create_session_monitor():
+    """Returns the platform's session monitor; a never-firing fake off Windows."""
+    if platform.system() == "Windows":
+        return WindowsSessionMonitor()
+    return FakeSessionMonitor()
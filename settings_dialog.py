@@ -318,44 +318,43 @@ class SettingsDialog(ctk.CTkToplevel):
         self.var_language.set("Auto")
 
     def save_settings(self):
-        self.config_manager.set("dot_color", self.var_color.get())
-        self.config_manager.set("dot_size", self.var_size.get())
-        self.config_manager.set("opacity_max", self.var_opacity.get() / 100.0)
-        self.config_manager.set("pulse_speed_ms", self.var_speed.get())
-        self.config_manager.set("always_on_top", self.var_top.get())
-
-        # Language
-        lang_display = self.var_language.get()
-        if lang_display == "Auto":
-            lang_code = "auto"
-        else:
-            # Reverse lookup: display name → code
-            languages = i18n.get_available_languages()
-            lang_code = next((k for k, v in languages.items() if v == lang_display), "en")
-        self.config_manager.set("language", lang_code)
-        i18n.set_language(lang_code)
+        # One transaction: subscribers see a single change, config.json is written once
+        with self.config_manager.batch():
+            self.config_manager.set("dot_color", self.var_color.get())
+            self.config_manager.set("dot_size", self.var_size.get())
+            self.config_manager.set("opacity_max", self.var_opacity.get() / 100.0)
+            self.config_manager.set("pulse_speed_ms", self.var_speed.get())
+            self.config_manager.set("always_on_top", self.var_top.get())
+
+            # Language
+            lang_display = self.var_language.get()
+            if lang_display == "Auto":
+                lang_code = "auto"
+            else:
+                # Reverse lookup: display name → code
+                languages = i18n.get_available_languages()
+                lang_code = next((k for k, v in languages.items() if v == lang_display), "en")
+            self.config_manager.set("language", lang_code)
+            i18n.set_language(lang_code)
+
+            # Auto-start (non-MSIX only has the toggle)
+            if hasattr(self, 'var_auto_start'):
+                import startup
+                want_auto = self.var_auto_start.get()
+                if want_auto:
+                    startup.enable_auto_start()
+                else:
+                    startup.disable_auto_start()
+                self.config_manager.set("auto_start", want_auto)
+
+            if self.reset_pos_requested:
+                self.config_manager.set("window_x", None)
+                self.config_manager.set("window_y", None)
+                self.config_manager.set("window_monitor", None)
 
         # Refresh tray menu labels immediately
         parent = self.master
-        if hasattr(parent, 'tray_controller') and parent.tray_controller.icon:
-            try:
-                parent.tray_controller.icon.update_menu()
-            except Exception:
-                pass
-
-        # Auto-start (non-MSIX only has the toggle)
-        if hasattr(self, 'var_auto_start'):
-            import startup
-            want_auto = self.var_auto_start.get()
-            if want_auto:
-                startup.enable_auto_start()
-            else:
-                startup.disable_auto_start()
-            self.config_manager.set("auto_start", want_auto)
-
-        if self.reset_pos_requested:
-            self.config_manager.set("window_x", None)
-            self.config_manager.set("window_y", None)
+        if getattr(parent, 'tray_controller', None):
+            parent.tray_controller.request_menu_update()
 
-        self.config_manager.save()
         self.destroy()
@@ -0,0 +1,361 @@
+"""
+Headless simulation of BreatheWindow on a virtual clock.
+
+Runs the real animation, scheduler and config-reaction code against a fake
+Tk surface and the in-memory Win32 backend, as fast as the CPU allows:
+
+    python simulation.py --ticks 1000000 --output sim_report.json
+    python simulation.py --ticks 2000 --set 30000:opacity_min=0.5 --alpha-out alphas.bin
+
+The report contains ticks/sec, OS calls per tick and a digest of the exact
+alpha sequence, so pulse() regressions show up on Linux CI.
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import logging
+import sys
+import time
+import tkinter as tk
+from array import array
+
+import win_utils
+from config_manager import ConfigManager, ConfigSnapshot
+from heartbeat_window import BreatheWindow
+from indicator import Indicator
+from monitors import FakeMonitorProvider, Monitor
+from session_monitor import FakeSessionMonitor
+
+NS_PER_MS = 1_000_000
+
+# Single 1080p monitor with a 40px taskbar at the bottom
+SIM_MONITORS = [Monitor("\\\\.\\DISPLAY1", (0, 0, 1920, 1080), (0, 0, 1920, 1040), True)]
+
+
+class VirtualClock:
+    """Monotonic nanosecond clock plus a timer queue; time only moves when events run."""
+
+    def __init__(self):
+        self.now_ns = 0
+        self._queue = []
+        self._seq = 0
+        self._cancelled = set()
+
+    def __call__(self):
+        return self.now_ns
+
+    def call_later(self, delay_ms, fn, args=()):
+        self._seq += 1
+        heapq.heappush(self._queue, (self.now_ns + int(delay_ms) * NS_PER_MS, self._seq, fn, args))
+        return self._seq
+
+    def cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def run_next(self):
+        """Runs the earliest pending event. Returns False when the queue is empty."""
+        while self._queue:
+            due, seq, fn, args = heapq.heappop(self._queue)
+            if seq in self._cancelled:
+                self._cancelled.discard(seq)
+                continue
+            if due > self.now_ns:
+                self.now_ns = due
+            fn(*args)
+            return True
+        return False
+
+
+class FakeCanvas:
+    """Accepts the Canvas calls BreatheWindow makes and counts redraws."""
+
+    def __init__(self, master, **kwargs):
+        self.options = dict(kwargs)
+        self.redraws = 0
+
+    def pack(self, **kwargs):
+        pass
+
+    def delete(self, *items):
+        pass
+
+    def create_oval(self, *coords, **kwargs):
+        self.redraws += 1
+        return self.redraws
+
+    def config(self, **kwargs):
+        self.options.update(kwargs)
+
+    configure = config
+
+    def bind(self, *args):
+        pass
+
+    def unbind(self, *args):
+        pass
+
+
+class FakeWidget:
+    """
+    Replaces the Tk window methods BreatheWindow and Indicator use with
+    in-memory versions driven by a VirtualClock. The real Tk __init__ is
+    never called, so no Tcl interpreter or display is created.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.sim_clock = self._pending_clock
+        self._title = ""
+        self._attributes = {}
+        self._geometry = ""
+        self._mapped = True
+        self.screen_size = (1920, 1080)
+
+    def after(self, ms, func=None, *args):
+        return self.sim_clock.call_later(ms, func, args)
+
+    def after_idle(self, func, *args):
+        return self.sim_clock.call_later(0, func, args)
+
+    def after_cancel(self, timer_id):
+        self.sim_clock.cancel(timer_id)
+
+    def title(self, string=None):
+        if string is None:
+            return self._title
+        self._title = string
+
+    def overrideredirect(self, flag=None):
+        pass
+
+    def attributes(self, *args):
+        if len(args) == 1:
+            return self._attributes.get(args[0], 0)
+        for name, value in zip(args[::2], args[1::2]):
+            self._attributes[name] = value
+
+    def config(self, **kwargs):
+        pass
+
+    configure = config
+
+    def geometry(self, spec=None):
+        if spec is None:
+            return self._geometry
+        self._geometry = spec
+
+    def bind(self, *args):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def winfo_id(self):
+        return 0x1234
+
+    def winfo_x(self):
+        return 0
+
+    def winfo_y(self):
+        return 0
+
+    def winfo_screenwidth(self):
+        return self.screen_size[0]
+
+    def winfo_screenheight(self):
+        return self.screen_size[1]
+
+    def deiconify(self):
+        self._mapped = True
+
+    def withdraw(self):
+        self._mapped = False
+
+    def destroy(self):
+        pass
+
+
+class FakeTk(FakeWidget, tk.Tk):
+    pass
+
+
+class FakeToplevel(FakeWidget, tk.Toplevel):
+    pass
+
+
+class SimulatedIndicator(Indicator, FakeToplevel):
+    """Indicator whose Toplevel base is FakeToplevel, sharing the root's clock."""
+
+    canvas_class = FakeCanvas
+
+    def __init__(self, root, index, spec):
+        self._pending_clock = root.sim_clock
+        super().__init__(root, index, spec)
+
+
+class SimulatedWindow(BreatheWindow, FakeTk):
+    """BreatheWindow whose Tk base is FakeTk (MRO puts FakeTk before tk.Tk)."""
+
+    canvas_class = FakeCanvas
+    indicator_class = SimulatedIndicator
+
+    def __init__(self, clock, **kwargs):
+        self._pending_clock = clock
+        super().__init__(clock=clock, **kwargs)
+
+
+class MemoryConfigManager(ConfigManager):
+    """ConfigManager that never touches the disk; saves are only counted."""
+
+    def __init__(self, overrides=None):
+        self._overrides = overrides or {}
+        super().__init__()
+
+    def load(self):
+        self.snapshot = ConfigSnapshot(self._overrides)
+
+    def save(self):
+        with self._lock:
+            self._dirty = False
+        self.write_count += 1
+
+    def schedule_save(self):
+        self.save()
+
+    def check_for_external_changes(self):
+        return {}
+
+
+class RecordingBackend(win_utils.FakeBackend):
+    """FakeBackend that keeps only the alpha bytes, in a compact array."""
+
+    def __init__(self):
+        super().__init__(record_calls=False)
+        self.alphas = array('B')
+
+    def set_layered_alpha(self, hwnd, color_key_hex, alpha_byte):
+        self.alphas.append(alpha_byte)
+        super().set_layered_alpha(hwnd, color_key_hex, alpha_byte)
+
+
+def parse_config_change(text):
+    """Parses "AT_MS:key=value" (value as JSON, falling back to a string)."""
+    at, assignment = text.split(":", 1)
+    key, raw = assignment.split("=", 1)
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return int(at), key, value
+
+
+def parse_stall(text):
+    """Parses "AT_MS:DURATION_MS"."""
+    at, duration = text.split(":", 1)
+    return int(at), int(duration)
+
+
+def run_simulation(ticks, config=None, changes=(), stalls=()):
+    """
+    Runs `ticks` pulse frames on a virtual clock. `changes` is a list of
+    (at_ms, key, value) config edits applied mid-run; `stalls` is a list of
+    (at_ms, duration_ms) periods where the event loop is blocked.
+    Returns (report, alphas).
+    """
+    clock = VirtualClock()
+    backend = RecordingBackend()
+    cfg = MemoryConfigManager(config)
+    window = SimulatedWindow(clock, config_manager=cfg, backend=backend,
+                             session_monitor=FakeSessionMonitor(),
+                             monitor_provider=FakeMonitorProvider(SIM_MONITORS))
+    window.apply_window_styles()  # What <Map> would trigger on screen
+    for indicator in window.indicators:
+        indicator.apply_window_styles()
+
+    for at_ms, key, value in changes:
+        clock.call_later(at_ms, cfg.set, (key, value))
+
+    lag_transitions = []
+    set_lag_level = window.set_lag_level
+
+    def record_lag_level(level):
+        if level != window.lag_level:
+            lag_transitions.append((clock.now_ns // NS_PER_MS, level))
+        set_lag_level(level)
+
+    window.set_lag_level = record_lag_level
+
+    def stall(duration_ms):
+        clock.now_ns += duration_ms * NS_PER_MS
+
+    for at_ms, duration_ms in stalls:
+        clock.call_later(at_ms, stall, (duration_ms,))
+
+    # Only count the steady-state loop, not construction
+    backend.reset_stats()
+    setup_alphas = len(backend.alphas)
+    scheduler = window.scheduler
+    target = scheduler.frames + ticks
+
+    start = time.perf_counter()
+    while scheduler.frames < target and clock.run_next():
+        pass
+    elapsed = time.perf_counter() - start
+
+    alphas = backend.alphas[setup_alphas:]
+    frames = scheduler.frames
+    report = {
+        "ticks": frames,
+        "virtual_ms": clock.now_ns / NS_PER_MS,
+        "wall_s": elapsed,
+        "ticks_per_sec": frames / elapsed if elapsed > 0 else None,
+        "os_calls": backend.total_calls(),
+        "os_calls_per_tick": backend.total_calls() / frames if frames else 0,
+        "os_calls_by_function": {name: count for name, (count, _) in backend.stats().items()},
+        "dropped_frames": scheduler.dropped_frames,
+        "config_writes": cfg.write_count,
+        "canvas_redraws": window.canvas.redraws,
+        "indicators": len(window.indicators),
+        "lag_transitions": lag_transitions,
+        "alpha_count": len(alphas),
+        "alpha_sha256": hashlib.sha256(alphas.tobytes()).hexdigest(),
+        "alpha_head": list(alphas[:64]),
+    }
+    return report, alphas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless BreatheWindow simulation")
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--set", dest="changes", action="append", default=[], metavar="AT_MS:KEY=VALUE",
+                        help="Config change to commit at a virtual time, e.g. 30000:opacity_min=0.5")
+    parser.add_argument("--stall", dest="stalls", action="append", default=[], metavar="AT_MS:DURATION_MS",
+                        help="Block the event loop for DURATION_MS at a virtual time")
+    parser.add_argument("--indicators", type=int, default=0,
+                        help="Extra indicator windows driven by the same scheduler")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--alpha-out", help="Write the raw alpha byte sequence here")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's periodic INFO logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # A long virtual run would otherwise log frame stats every virtual minute
+        logging.getLogger("heartbeat_window").setLevel(logging.WARNING)
+
+    changes = [parse_config_change(c) for c in args.changes]
+    stalls = [parse_stall(s) for s in args.stalls]
+    config = {"indicators": [{"anchor": "top_center"}] * args.indicators}
+    report, alphas = run_simulation(args.ticks, config=config, changes=changes, stalls=stalls)
+
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    if args.alpha_out:
+        with open(args.alpha_out, "wb") as f:
+            alphas.tofile(f)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
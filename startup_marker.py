@@ -0,0 +1,5 @@
+# Printed to stdout by main.py on the first pulse when started with
+# --exit-after-first-pulse; bench_startup.py waits for it. Kept in its own
+# module so the benchmark can import it without importing (and setting up
+# logging for) the app.
+FIRST_PULSE_MARKER = "RDPHB_FIRST_PULSE"
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+# The app is a set of flat modules at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_manager import ConfigManager  # noqa: E402
+from monitors import FakeMonitorProvider, Monitor  # noqa: E402
+from session_monitor import FakeSessionMonitor  # noqa: E402
+import simulation  # noqa: E402
+
+PRIMARY = Monitor("\\\\.\\DISPLAY1", (0, 0, 1920, 1080), (0, 0, 1920, 1040), True)
+SECONDARY = Monitor("\\\\.\\DISPLAY2", (1920, 0, 3840, 1080), (1920, 0, 3840, 1080), False)
+
+
+@pytest.fixture
+def clock():
+    return simulation.VirtualClock()
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    """ConfigManager subclass that keeps config.json under tmp_path."""
+    class TmpConfigManager(ConfigManager):
+        SAVE_DELAY_S = 0.01
+
+        def get_config_dir(self):
+            return str(tmp_path)
+
+    return TmpConfigManager
+
+
+@pytest.fixture
+def make_window(clock):
+    """Builds a headless BreatheWindow (simulation.SimulatedWindow) on the virtual clock."""
+    windows = []
+
+    def make(config=None, monitors=(PRIMARY, SECONDARY), config_manager=None):
+        window = simulation.SimulatedWindow(
+            clock,
+            config_manager=config_manager or simulation.MemoryConfigManager(config),
+            backend=simulation.RecordingBackend(),
+            session_monitor=FakeSessionMonitor(),
+            monitor_provider=FakeMonitorProvider(monitors))
+        window.apply_window_styles()  # What <Map> would trigger on screen
+        windows.append(window)
+        return window
+
+    yield make
+    for window in windows:
+        window.scheduler.stop()
+
+
+def run_for(clock, ms):
+    """Runs virtual-clock events until `ms` milliseconds have passed."""
+    end = clock.now_ns + ms * 1_000_000
+    while clock._queue and clock._queue[0][0] <= end:
+        clock.run_next()
+    clock.now_ns = max(clock.now_ns, end)
@@ -0,0 +1,34 @@
+from bench_startup import parse_importtime
+
+# Trimmed `-X importtime` output: children are listed before their parents
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       200 |        200 |     PIL._version
+import time:       900 |       1500 |   PIL
+import time:       100 |        100 |       PIL._util
+import time:      2000 |       2100 |     PIL.Image
+import time:       300 |       2400 |   pystray
+import time:      5000 |       9000 | customtkinter
+import time:       400 |        400 | pywintypes
+some unrelated stderr line
+"""
+
+
+def test_submodules_counted_once_via_outermost_import():
+    totals = parse_importtime(IMPORTTIME)
+    assert totals["customtkinter"] == 9.0
+    assert totals["PIL"] == 3.6  # PIL and PIL.Image, but not PIL._version or PIL._util again
+    assert totals["pystray"] == 2.4
+    assert totals["win32"] == 0.4
+
+
+def test_top_level_imports_add_up():
+    totals = parse_importtime(
+        "import time:       100 |       1000 | PIL\n"
+        "import time:       100 |        500 | PIL.ImageDraw\n")
+    assert totals["PIL"] == 1.5
+    assert totals["customtkinter"] == 0.0
+
+
+def test_empty_output():
+    assert parse_importtime("") == {"customtkinter": 0.0, "PIL": 0.0, "pystray": 0.0, "win32": 0.0}
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from command_queue import CommandQueue, EXIT, HIDE, SHOW
+
+
+def test_commands_run_in_order_on_drain():
+    queue = CommandQueue(clock=lambda: 0)
+    ran = []
+    queue.register(SHOW, lambda payload: ran.append(("show", payload)))
+    queue.register(HIDE, lambda payload: ran.append(("hide", payload)))
+    queue.put(SHOW, 1)
+    queue.put(HIDE)
+    assert ran == []  # Nothing runs on the producing thread
+    assert queue.drain() == 2
+    assert ran == [("show", 1), ("hide", None)]
+
+
+def test_full_queue_rejects_without_blocking():
+    queue = CommandQueue(capacity=2)
+    assert queue.put(SHOW) and queue.put(SHOW)
+    assert not queue.put(SHOW)
+    assert queue.rejected == 1
+    assert len(queue) == 2
+
+
+def test_drain_is_batched():
+    queue = CommandQueue()
+    queue.register(SHOW, lambda payload: None)
+    for _ in range(20):
+        queue.put(SHOW)
+    assert queue.drain(max_batch=16) == 16
+    assert queue.drain(max_batch=16) == 4
+
+
+def test_handler_error_does_not_stop_the_batch():
+    queue = CommandQueue()
+    ran = []
+    queue.register(SHOW, lambda payload: 1 / 0)
+    queue.register(HIDE, ran.append)
+    queue.put(SHOW)
+    queue.put(HIDE, "after")
+    queue.drain()
+    assert ran == ["after"]
+
+
+def test_latency_is_recorded():
+    now = [0]
+    queue = CommandQueue(clock=lambda: now[0])
+    queue.register(EXIT, lambda payload: None)
+    queue.put(EXIT)
+    now[0] = 5_000_000
+    queue.drain()
+    assert queue.latency[EXIT] == [1, 5_000_000, 5_000_000]
+    assert queue.format_summary() == "exit 1x avg 5 max 5 ms"
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        CommandQueue().put("reboot")
+
+
+def test_concurrent_producers():
+    queue = CommandQueue(capacity=10_000)
+    threads = [threading.Thread(target=lambda: [queue.put(SHOW) for _ in range(500)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(queue) == 2000
@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+
+import pytest
+
+from config_manager import ConfigSnapshot, DEFAULT_CONFIG
+
+
+# ── Validation ──
+
+@pytest.mark.parametrize("values, key, expected", [
+    ({"dot_size": 10_000}, "dot_size", 256),
+    ({"dot_size": "12"}, "dot_size", 12),
+    ({"dot_size": True}, "dot_size", DEFAULT_CONFIG["dot_size"]),
+    ({"dot_size": float("inf")}, "dot_size", DEFAULT_CONFIG["dot_size"]),
+    ({"dot_size": float("nan")}, "dot_size", DEFAULT_CONFIG["dot_size"]),
+    ({"window_x": float("inf")}, "window_x", None),
+    ({"window_x": -50}, "window_x", -50),
+    ({"opacity_max": float("nan")}, "opacity_max", DEFAULT_CONFIG["opacity_max"]),
+    ({"opacity_max": float("-inf")}, "opacity_max", DEFAULT_CONFIG["opacity_max"]),
+    ({"opacity_min": -1}, "opacity_min", 0.0),
+    ({"dot_color": "#0f0"}, "dot_color", "#00FF00"),
+    ({"dot_color": "nope"}, "dot_color", DEFAULT_CONFIG["dot_color"]),
+    ({"pulse_curve": "square"}, "pulse_curve", DEFAULT_CONFIG["pulse_curve"]),
+])
+def test_validation(values, key, expected):
+    assert getattr(ConfigSnapshot(values), key) == expected
+
+
+def test_snapshot_is_immutable():
+    with pytest.raises(AttributeError):
+        ConfigSnapshot().dot_size = 20
+
+
+def test_unknown_keys_survive_round_trip():
+    snapshot = ConfigSnapshot({"future_key": 1, "dot_size": 20})
+    assert snapshot.to_dict()["future_key"] == 1
+    assert snapshot.replace({"dot_size": 30}).get("future_key") == 1
+
+
+def test_inverted_pairs_keep_previous_values():
+    snapshot = ConfigSnapshot({"opacity_min": 0.9, "opacity_max": 0.2,
+                               "lag_warn_ms": 900, "lag_critical_ms": 100})
+    assert (snapshot.opacity_min, snapshot.opacity_max) == (0.3, 1.0)
+    assert (snapshot.lag_warn_ms, snapshot.lag_critical_ms) == (150, 500)
+
+
+def test_single_edit_moves_the_other_bound():
+    snapshot = ConfigSnapshot()
+    lowered = snapshot.replace({"opacity_max": 0.1})
+    assert (lowered.opacity_min, lowered.opacity_max) == (0.1, 0.1)
+    raised = snapshot.replace({"lag_warn_ms": 800})
+    assert (raised.lag_warn_ms, raised.lag_critical_ms) == (800, 800)
+
+
+# ── ConfigManager ──
+
+def test_set_notifies_subscribers_once(config_dir):
+    cfg = config_dir()
+    seen = []
+    cfg.subscribe(["dot_size"], seen.append)
+    cfg.subscribe(["dot_color"], lambda changed: pytest.fail("unrelated key notified"))
+    cfg.set("dot_size", 24)
+    cfg.set("dot_size", 24)  # No change, no notification
+    assert seen == [{"dot_size": 24}]
+
+
+def test_unsubscribe_and_dispatcher(config_dir):
+    cfg = config_dir()
+    seen, pending = [], []
+    cfg.set_dispatcher(pending.append)
+    token = cfg.subscribe(["dot_size"], seen.append)
+    cfg.set("dot_size", 24)
+    assert seen == []  # Delivery is left to the dispatcher
+    pending.pop()()
+    assert seen == [{"dot_size": 24}]
+    cfg.unsubscribe(token)
+    cfg.set("dot_size", 30)
+    assert pending == []
+
+
+def test_bound_moved_by_ordering_is_notified(config_dir):
+    cfg = config_dir()
+    seen = []
+    cfg.subscribe(["opacity_min", "opacity_max"], seen.append)
+    cfg.set("opacity_max", 0.2)
+    assert seen == [{"opacity_min": 0.2, "opacity_max": 0.2}]
+
+
+def test_batch_commits_once(config_dir):
+    cfg = config_dir()
+    seen = []
+    cfg.subscribe(["dot_size", "dot_color"], seen.append)
+    with cfg.batch():
+        cfg.set("dot_size", 20)
+        cfg.set("dot_color", "#FF0000")
+        assert cfg.snapshot.dot_size == DEFAULT_CONFIG["dot_size"]  # Not published yet
+        assert cfg.get("dot_size") == 20  # But visible to the batch's own thread
+    assert seen == [{"dot_size": 20, "dot_color": "#FF0000"}]
+    assert cfg.snapshot.dot_size == 20
+
+
+def test_failed_batch_is_discarded(config_dir):
+    cfg = config_dir()
+    cfg.flush()
+    writes = cfg.write_count
+    seen = []
+    cfg.subscribe(["dot_size", "dot_color"], seen.append)
+    with pytest.raises(RuntimeError):
+        with cfg.batch():
+            cfg.set("dot_size", 20)
+            with cfg.batch():
+                cfg.set("dot_color", "#FF0000")
+            raise RuntimeError("boom")
+    assert cfg.snapshot.dot_size == DEFAULT_CONFIG["dot_size"]
+    assert cfg.snapshot.dot_color == DEFAULT_CONFIG["dot_color"]
+    assert seen == []
+    cfg.flush()
+    assert cfg.write_count == writes
+
+    # The manager is usable again afterwards
+    cfg.set("dot_size", 30)
+    assert seen == [{"dot_size": 30}]
+
+
+def test_save_is_atomic_and_debounced(config_dir):
+    cfg = config_dir()
+    writes = cfg.write_count
+    for size in range(20, 30):
+        cfg.set("dot_size", size)
+    cfg.flush()
+    assert cfg.write_count == writes + 1
+    with open(cfg.get_config_path()) as f:
+        assert json.load(f)["dot_size"] == 29
+    assert not os.path.exists(cfg.get_config_path() + ".tmp")
+
+
+def test_concurrent_saves_do_not_collide(config_dir):
+    cfg = config_dir()
+    writes = cfg.write_count
+
+    def save_repeatedly():
+        for _ in range(25):
+            cfg.save()
+
+    # What the debounce timer and the exit-time flush() can do at once
+    threads = [threading.Thread(target=save_repeatedly) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    cfg.set("dot_size", 42)
+    for thread in threads:
+        thread.join()
+    cfg.flush()
+    assert cfg.write_count - writes >= 100  # Every save landed, none lost its temp file
+    with open(cfg.get_config_path()) as f:
+        assert json.load(f)["dot_size"] == 42
+    assert not os.path.exists(cfg.get_config_path() + ".tmp")
+
+
+def write_external(cfg, text):
+    path = cfg.get_config_path()
+    with open(path, "w") as f:
+        f.write(text)
+    # Make sure the signature differs even on coarse mtime filesystems
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_hot_reload_delivers_changed_keys(config_dir):
+    cfg = config_dir()
+    seen = []
+    cfg.subscribe(["dot_size", "dot_color"], seen.append)
+    write_external(cfg, json.dumps({"dot_size": 40, "dot_color": cfg.get("dot_color")}))
+    assert cfg.check_for_external_changes() == {"dot_size": 40}
+    assert seen == [{"dot_size": 40}]
+    assert cfg.check_for_external_changes() == {}  # Unchanged file is not re-parsed
+
+
+def test_hot_reload_survives_non_finite_numbers(config_dir):
+    cfg = config_dir()
+    write_external(cfg, '{"dot_size": Infinity, "window_x": -Infinity, "opacity_max": NaN, "pulse_speed_ms": 80}')
+    assert cfg.check_for_external_changes() == {"pulse_speed_ms": 80}
+    assert cfg.snapshot.dot_size == DEFAULT_CONFIG["dot_size"]
+    assert cfg.snapshot.window_x is None
+
+
+def test_hot_reload_ignores_garbage(config_dir):
+    cfg = config_dir()
+    write_external(cfg, "[1, 2")
+    assert cfg.check_for_external_changes() == {}
+    write_external(cfg, "[1, 2]")
+    assert cfg.check_for_external_changes() == {}
+
+
+def test_indicator_specs_are_validated():
+    snapshot = ConfigSnapshot({"indicators": [
+        {"monitor": "\\\\.\\DISPLAY2", "anchor": "top_center", "offset_x": "220", "offset_y": 0,
+         "color": "#f0f", "size": 1000, "note": "kept"},
+        {"anchor": "middle", "color": "magenta", "size": "big", "offset_x": float("inf"), "monitor": 2},
+        "not a spec",
+    ]})
+    assert snapshot.indicators == (
+        {"monitor": "\\\\.\\DISPLAY2", "anchor": "top_center", "offset_x": 220, "offset_y": 0,
+         "color": "#FF00FF", "size": 256, "note": "kept"},
+        {},  # Every bad value dropped: the dot falls back as if they were unset
+    )
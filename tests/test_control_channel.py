@@ -0,0 +1,59 @@
+import pytest
+
+from control_channel import ControlServer, send_command
+
+
+@pytest.fixture
+def address(tmp_path_factory):
+    # Unix socket paths are limited to ~100 bytes, so keep it short
+    return str(tmp_path_factory.mktemp("ctl") / "s.sock")
+
+
+@pytest.fixture
+def serve(address):
+    servers = []
+
+    def start(handler):
+        server = ControlServer(handler, address, "AF_UNIX")
+        assert server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def test_round_trip(serve, address):
+    received = []
+    serve(received.append)
+    assert send_command(["--color", "#FF0000"], address, "AF_UNIX") == {"ok": True}
+    assert received == [["--color", "#FF0000"]]
+
+
+def test_handler_error_is_reported(serve, address):
+    def handler(argv):
+        raise ValueError(f"bad arguments: {argv}")
+
+    serve(handler)
+    assert send_command(["--nope"], address, "AF_UNIX") == {"ok": False, "error": "bad arguments: ['--nope']"}
+
+
+def test_stale_socket_is_replaced(serve, address):
+    open(address, "w").close()  # Left behind by a crashed instance
+    serve(lambda argv: None)
+    assert send_command([], address, "AF_UNIX") == {"ok": True}
+
+
+def test_no_instance_listening(address):
+    assert send_command(["--show"], address, "AF_UNIX") is None
+
+
+def test_unremovable_stale_socket_fails_start(address, monkeypatch):
+    def unlink(path):
+        raise PermissionError(13, "Permission denied", path)
+
+    open(address, "w").close()
+    monkeypatch.setattr("control_channel.os.unlink", unlink)
+    server = ControlServer(lambda argv: None, address, "AF_UNIX")
+    assert not server.start()  # Reported like any other endpoint error, not raised into main()
@@ -0,0 +1,44 @@
+import pytest
+
+from dot_renderer import AtlasCache, DotAtlas
+
+
+def test_atlas_has_one_frame_per_distinct_level():
+    atlas = DotAtlas("#FF0000", 8, [255, 0, 128, 255])
+    assert atlas.levels == (0, 128, 255)
+    assert atlas.frame_count == 3
+    assert len(atlas.pixels) == 8 * 8 * 4 * 3
+    assert atlas.index[128] == 1
+    assert atlas.index[64] == -1
+
+
+def test_frames_are_premultiplied_bgra():
+    atlas = DotAtlas("#FF8000", 16, [0, 128, 255])
+    center = (8 * 16 + 8) * 4  # Fully covered pixel in the middle of the disc
+    b, g, r, a = atlas.frame_bytes(255)[center:center + 4]
+    assert (b, g, r, a) == (0, 0x80, 0xFF, 255)
+    b, g, r, a = atlas.frame_bytes(128)[center:center + 4]
+    assert a == 128
+    assert (b, g, r) == (0, 0x80 * 128 // 255, 0xFF * 128 // 255)
+    assert set(atlas.frame_bytes(0)) == {0}
+    assert atlas.frame_bytes(255)[:4] == b"\0\0\0\0"  # Corner is outside the disc
+
+
+def test_missing_level_raises():
+    atlas = DotAtlas("#FFFFFF", 4, [255])
+    with pytest.raises(KeyError):
+        atlas.frame_bytes(10)
+
+
+def test_cache_reuses_and_evicts_least_recent():
+    cache = AtlasCache(capacity=2)
+    first = cache.get("#ff0000", 8, [0, 255])
+    assert cache.get("#FF0000", 8, [255, 0, 0]) is first  # Same key after normalizing
+    cache.get("#00FF00", 8, [0, 255])
+    cache.get("#FF0000", 8, [0, 255])  # Touch, so the green atlas is evicted next
+    cache.get("#0000FF", 8, [0, 255])
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert cache.get("#FF0000", 8, [0, 255]) is first
+    cache.get("#00FF00", 8, [0, 255])
+    assert cache.misses == 4
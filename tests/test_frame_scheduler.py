@@ -0,0 +1,75 @@
+from frame_scheduler import FrameScheduler, NS_PER_MS
+
+
+class FakeRoot:
+    """after()/after_cancel() on a VirtualClock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def after(self, ms, func):
+        return self.clock.call_later(ms, func)
+
+    def after_cancel(self, timer_id):
+        self.clock.cancel(timer_id)
+
+
+def make_scheduler(clock, period_ms=50, callback=None):
+    ticks = []
+    scheduler = FrameScheduler(FakeRoot(clock), callback or ticks.append, period_ms, clock=clock)
+    return scheduler, ticks
+
+
+def test_ticks_land_on_absolute_deadlines(clock):
+    times = []
+    scheduler, _ = make_scheduler(clock, callback=lambda frames: times.append(clock()))
+    scheduler.start()
+    for _ in range(10):
+        clock.run_next()
+    assert times == [(i + 1) * 50 * NS_PER_MS for i in range(10)]
+    assert scheduler.dropped_frames == 0
+
+
+def test_slow_callback_does_not_drift(clock):
+    times = []
+
+    def slow(frames):
+        times.append(clock())
+        clock.now_ns += 20 * NS_PER_MS  # Callback itself takes 20 ms
+
+    scheduler, _ = make_scheduler(clock, callback=slow)
+    scheduler.start()
+    for _ in range(5):
+        clock.run_next()
+    assert times == [(i + 1) * 50 * NS_PER_MS for i in range(5)]
+
+
+def test_stall_drops_missed_frames(clock):
+    scheduler, ticks = make_scheduler(clock)
+    scheduler.start()
+    clock.run_next()  # Frame at 50 ms
+    clock.now_ns += 230 * NS_PER_MS  # Event loop blocked: next frame due at 100 ms fires at 280 ms
+    clock.run_next()
+    assert ticks == [1, 4]  # 100, 150, 200, 250 ms elapsed in one call
+    assert scheduler.dropped_frames == 3
+    assert scheduler.last_lateness_ns == 180 * NS_PER_MS
+    assert scheduler.next_deadline_ns == 300 * NS_PER_MS
+
+
+def test_stop_cancels_pending_tick(clock):
+    scheduler, ticks = make_scheduler(clock)
+    scheduler.start()
+    scheduler.stop()
+    assert not clock.run_next()
+    assert ticks == []
+
+
+def test_set_period_reanchors_without_dropping(clock):
+    scheduler, ticks = make_scheduler(clock)
+    scheduler.start()
+    clock.run_next()
+    scheduler.set_period(200)
+    clock.run_next()
+    assert clock() == 250 * NS_PER_MS
+    assert ticks == [1, 1]
+    assert scheduler.dropped_frames == 0
@@ -0,0 +1,58 @@
+from frame_stats import FrameIntervalRecorder, HISTOGRAM_BUCKETS, NS_PER_MS
+
+
+def test_first_tick_records_nothing():
+    recorder = FrameIntervalRecorder()
+    recorder.record_tick(5 * NS_PER_MS)
+    assert recorder.count == 0
+    assert recorder.summary() is None
+
+
+def test_percentiles_over_window():
+    recorder = FrameIntervalRecorder()
+    for ms in range(1, 101):
+        recorder.record(ms * NS_PER_MS)
+    summary = recorder.summary()
+    assert summary["samples"] == 100
+    assert summary["p50"] == 51
+    assert summary["p95"] == 96
+    assert summary["p99"] == 100
+    assert summary["max"] == 100
+
+
+def test_ring_keeps_latest_capacity_samples():
+    recorder = FrameIntervalRecorder(capacity=4)
+    for ms in (500, 1, 2, 3, 4):
+        recorder.record(ms * NS_PER_MS)
+    assert recorder.window() == [ms * NS_PER_MS for ms in (1, 2, 3, 4)]
+    assert recorder.summary()["max"] == 4
+    assert recorder.summary()["max_all"] == 500
+
+
+def test_histogram_buckets_are_log2_ms():
+    recorder = FrameIntervalRecorder()
+    recorder.record(NS_PER_MS // 2)   # <1 ms
+    recorder.record(50 * NS_PER_MS)   # 32-63 ms
+    recorder.record(63 * NS_PER_MS)   # 32-63 ms
+    recorder.record(10**12)           # Way past the last bucket
+    assert recorder.histogram_summary() == [
+        ("<1ms", 1), ("32-63ms", 2), (f">={1 << (HISTOGRAM_BUCKETS - 2)}ms", 1)]
+
+
+def test_mark_gap_skips_pause_interval():
+    recorder = FrameIntervalRecorder()
+    recorder.record_tick(0)
+    recorder.record_tick(50 * NS_PER_MS)
+    recorder.mark_gap()
+    recorder.record_tick(60_000 * NS_PER_MS)
+    recorder.record_tick(60_050 * NS_PER_MS)
+    assert recorder.window() == [50 * NS_PER_MS, 50 * NS_PER_MS]
+
+
+def test_reset_clears_everything():
+    recorder = FrameIntervalRecorder()
+    recorder.record(10 * NS_PER_MS)
+    recorder.reset()
+    assert recorder.count == 0
+    assert recorder.histogram_summary() == []
+    assert recorder.summary() is None
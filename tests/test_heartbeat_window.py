@@ -0,0 +1,180 @@
+import tracemalloc
+
+import profiler
+from conftest import run_for
+from heartbeat_window import HEALTHY, LAGGING, STALLED
+
+
+def test_pulse_presents_only_changed_alpha(make_window, clock):
+    window = make_window({"pulse_curve": "triangle", "pulse_speed_ms": 50})
+    backend = window.win32
+    backend.reset_stats()
+    run_for(clock, 50 * 100)
+    assert window.scheduler.frames == 100
+    assert backend.call_counts["set_layered_alpha"] <= 100
+    assert backend.alphas[-1] == window.alpha_byte == window.waveform.current()
+
+
+def test_config_change_rebuilds_waveform(make_window, clock):
+    window = make_window()
+    window.cfg.set("opacity_min", 0.8)
+    run_for(clock, 100)
+    assert min(window.waveform.table) == round(0.8 * 255)
+
+
+def test_suspend_stops_the_timer(make_window, clock):
+    window = make_window()
+    window.session_monitor.set_locked(True)
+    run_for(clock, 10)
+    frames = window.scheduler.frames
+    run_for(clock, 5000)
+    assert window.scheduler.frames == frames
+    assert not window.scheduler.running
+    window.session_monitor.set_locked(False)
+    run_for(clock, 500)
+    assert window.scheduler.frames > frames
+
+
+def stall(clock, ms):
+    """Blocks the virtual event loop, as a slow callback would."""
+    clock.now_ns += ms * 1_000_000
+
+
+def test_lag_level_follows_thresholds(make_window, clock):
+    window = make_window({"lag_warn_ms": 150, "lag_critical_ms": 500,
+                          "lag_warn_color": "#FFA500", "lag_critical_color": "#FF0000"})
+    run_for(clock, 100)
+    assert window.lag_level == 0
+    stall(clock, 200)
+    run_for(clock, 50)
+    assert window.lag_level == 1
+    assert window.current_color() == "#FFA500"
+    stall(clock, 600)
+    run_for(clock, 50)
+    assert window.lag_level == 2  # Escalates at once
+    run_for(clock, 50 * (window.LAG_RECOVERY_FRAMES - 2))
+    assert window.lag_level == 2  # Not yet a full run of on-time frames
+    run_for(clock, 50 * 3)
+    assert window.lag_level == 0
+    assert window.current_color() == window.dot_color
+
+
+def test_lag_indicator_off_never_recolors(make_window, clock):
+    window = make_window({"lag_indicator": False})
+    stall(clock, 5000)
+    run_for(clock, 100)
+    assert window.lag_level == 0
+
+
+def test_health_reports_stall(make_window, clock):
+    window = make_window({"tray_status_icon": True})
+    run_for(clock, 1000)
+    assert window.health() == HEALTHY
+    stall(clock, window.HEALTH_STALL_MS + 100)
+    assert window.health() == STALLED
+
+
+def test_health_reports_lag_and_is_off_by_default(make_window, clock):
+    window = make_window({"tray_status_icon": True})
+    stall(clock, 300)
+    run_for(clock, 50)
+    assert window.health() == LAGGING
+    assert make_window().health() is None
+
+
+def test_health_stamp_follows_status_icon_setting(make_window, clock):
+    window = make_window()
+    assert window._stamp_id is None  # Nobody reads the stamp
+    window.cfg.set("tray_status_icon", True)
+    run_for(clock, 10)
+    assert window._stamp_id is not None
+    window.cfg.set("tray_status_icon", False)
+    run_for(clock, 10)
+    assert window._stamp_id is None
+
+
+def test_no_health_stamp_while_suspended(make_window, clock):
+    window = make_window({"tray_status_icon": True})
+    window.hide()
+    assert window._stamp_id is None
+    run_for(clock, 10_000)
+    assert window.health() == HEALTHY  # The idle command poll keeps the loop marked alive
+    stall(clock, window.HEALTH_STALL_MS + 100)
+    assert window.health() == STALLED
+    window.show()
+    assert window._stamp_id is not None
+
+
+def test_commands_run_while_paused(make_window, clock):
+    window = make_window()
+    window.hide()
+    window.commands.put("show")
+    run_for(clock, window.COMMAND_IDLE_POLL_MS + 50)
+    assert window.scheduler.running
+
+
+def test_paused_window_polls_commands_rarely(make_window, clock, monkeypatch):
+    window = make_window()
+    window.hide()
+    drains = []
+    monkeypatch.setattr(window.commands, "drain", lambda: drains.append(clock()) or 0)
+    run_for(clock, 10_000)
+    assert len(drains) == 10_000 // window.COMMAND_IDLE_POLL_MS
+
+
+def test_hot_reload_timer_survives_errors(make_window, clock):
+    window = make_window()
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise OverflowError("cannot convert float infinity to integer")
+
+    window.cfg.check_for_external_changes = broken
+    run_for(clock, window.CONFIG_CHECK_MS * 3 + 10)
+    assert len(calls) == 3
+
+
+def test_profiling_writes_reports(make_window, clock, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "_get_log_dir", lambda: str(tmp_path))
+    window = make_window()
+    window.start_profiling(1)
+    assert tracemalloc.is_tracing()
+    run_for(clock, 1100)
+    assert window._profiling is None
+    assert not tracemalloc.is_tracing()
+    assert sorted(p.name.split("_")[0] for p in tmp_path.iterdir()) == ["alloc", "profile", "profile"]
+
+
+def test_profiling_window_is_bounded(make_window, clock, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "_get_log_dir", lambda: str(tmp_path))
+    window = make_window()
+    window.start_profiling(1e7)
+    assert window._profiling.duration_s == profiler.MAX_DURATION_S
+    run_for(clock, profiler.MAX_DURATION_S * 1000 + 100)
+    assert window._profiling is None
+    assert not tracemalloc.is_tracing()
+    assert sorted(p.name.split("_")[0] for p in tmp_path.iterdir()) == ["alloc", "profile", "profile"]
+
+
+def test_profiling_start_failure_leaves_nothing_running(make_window, clock, monkeypatch):
+    class BrokenProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiler.cProfile, "Profile", BrokenProfile)
+    window = make_window()
+    window.start_profiling(5)
+    assert window._profiling is None
+    assert not tracemalloc.is_tracing()
+    run_for(clock, 6000)  # The cancelled stop timer must not fire into a missing session
+
+
+def test_toolwindow_only_set_on_windows(make_window, monkeypatch):
+    window = make_window({"indicators": [{}]})
+    assert "-toolwindow" not in window._attributes  # Unknown to X11 Tk, where it raises
+    assert "-toolwindow" not in window.indicators[0]._attributes
+    monkeypatch.setattr("platform.system", lambda: "Windows")
+    window = make_window({"indicators": [{}]})
+    assert window._attributes["-toolwindow"] is True
+    assert window.indicators[0]._attributes["-toolwindow"] is True
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+import i18n
+
+
+@pytest.fixture
+def catalogs(tmp_path, monkeypatch):
+    """Points i18n at catalogs under tmp_path and restores its state afterwards."""
+    def write(lang, strings):
+        (tmp_path / f"{lang}.json").write_text(json.dumps(strings), encoding="utf-8")
+
+    monkeypatch.setattr(i18n, "_locales_path", lambda lang: str(tmp_path / f"{lang}.json"))
+    monkeypatch.setattr(i18n, "_strings", None)
+    monkeypatch.setattr(i18n, "_current_lang", "en")
+    monkeypatch.setattr(i18n, "_config_manager", None)
+    write("en", {"tray.exit": "Exit", "tray.settings": "Settings"})
+    write("zh", {"tray.exit": "退出"})
+    return write
+
+
+def test_missing_keys_fall_back_to_english(catalogs, config_dir):
+    cfg = config_dir()
+    cfg.set("language", "zh")
+    i18n.init(cfg)
+    assert i18n.t("tray.exit") == "退出"
+    assert i18n.t("tray.settings") == "Settings"
+    assert i18n.t("no_such_key") == "no_such_key"
+
+
+def test_missing_catalog_falls_back_to_keys(catalogs, tmp_path):
+    (tmp_path / "en.json").unlink()
+    assert i18n.t("tray.exit") == "tray.exit"
+
+
+def test_set_language_swaps_catalog_and_persists(catalogs, config_dir):
+    cfg = config_dir()
+    cfg.set("language", "en")
+    i18n.init(cfg)
+    assert i18n.t("tray.exit") == "Exit"
+    i18n.set_language("zh")
+    assert i18n.get_language() == "zh"
+    assert i18n.t("tray.exit") == "退出"
+    assert cfg.get("language") == "zh"
+
+
+def test_set_language_ignores_unknown_codes(catalogs):
+    i18n.set_language("xx")
+    assert i18n.get_language() == "en"
+
+
+def test_shipped_catalogs_have_the_same_keys():
+    with open(i18n._locales_path("en"), encoding="utf-8") as f:
+        english = json.load(f)
+    for lang in i18n.LANGUAGES:
+        with open(i18n._locales_path(lang), encoding="utf-8") as f:
+            assert json.load(f).keys() == english.keys(), lang
@@ -0,0 +1,71 @@
+from conftest import PRIMARY, SECONDARY, run_for
+from indicator import anchor_position
+
+
+def geometry_xy(window):
+    _, x, y = window.geometry().split("+")
+    return int(x), int(y)
+
+
+def test_anchor_position():
+    work = (0, 0, 1920, 1040)
+    assert anchor_position(work, 16, "bottom_right", 8, 8) == (1920 - 16 - 8, 1040 - 16 - 8)
+    assert anchor_position(work, 16, "top_left", 8, 8) == (8, 8)
+    assert anchor_position(work, 16, "top_center", 220, 0) == ((1920 - 16) // 2 + 220, 0)
+
+
+def test_indicators_follow_config(make_window, clock):
+    window = make_window({"indicators": [{"monitor": SECONDARY.name, "anchor": "top_left",
+                                          "offset_x": 10, "offset_y": 20, "color": "#FF00FF"}]})
+    (indicator,) = window.indicators
+    assert geometry_xy(indicator) == (1920 + 10, 20)
+    assert indicator.color == "#FF00FF"
+    assert indicator.size == window.size  # Unset size follows the main dot
+
+    window.cfg.set("indicators", [])
+    run_for(clock, 10)
+    assert window.indicators == []
+
+
+def test_one_indicator_per_other_monitor(make_window):
+    window = make_window({"indicator_on_every_monitor": True})
+    (indicator,) = window.indicators
+    assert indicator.spec == {"monitor": SECONDARY.name}
+    assert geometry_xy(indicator) == (3840 - indicator.size - 8, 1080 - indicator.size - 8)
+
+
+def test_unknown_monitor_falls_back_to_primary(make_window):
+    window = make_window({"indicators": [{"monitor": "\\\\.\\DISPLAY9", "anchor": "top_left"}]})
+    assert geometry_xy(window.indicators[0]) == (PRIMARY.work[0] + 8, PRIMARY.work[1] + 8)
+
+
+def test_indicators_share_the_main_frame(make_window, clock):
+    window = make_window({"pulse_curve": "triangle", "indicators": [{}, {}]})
+    for indicator in window.indicators:
+        indicator.apply_window_styles()
+    backend = window.win32
+    backend.reset_stats()
+    run_for(clock, window.pulse_speed_ms * 10)
+    assert window.scheduler.frames == 10
+    # Every dot presents the same alpha, one call each per changed frame
+    assert backend.call_counts["set_layered_alpha"] == 3 * 10
+    assert {indicator._last_applied_alpha_int for indicator in window.indicators} == {window.alpha_byte}
+
+
+def test_failed_indicator_is_destroyed(make_window, clock, monkeypatch):
+    window = make_window()
+    destroyed = []
+
+    class BrokenIndicator(window.indicator_class):
+        def apply_spec(self, spec):
+            raise RuntimeError("window creation failed")
+
+        def destroy(self):
+            destroyed.append(self)
+            super().destroy()
+
+    monkeypatch.setattr(window, "indicator_class", BrokenIndicator)
+    window.cfg.set("indicators", [{}])
+    run_for(clock, 10)
+    assert window.indicators == []
+    assert len(destroyed) == 1
@@ -0,0 +1,64 @@
+import logging
+
+import logger as app_logger
+from logger import RateLimitFilter, get_logger
+
+
+def test_loggers_share_one_queue_handler():
+    first = get_logger("test.first")
+    second = get_logger("test.second")
+    assert first.handlers == second.handlers == [app_logger._queue_handler]
+    assert get_logger("test.first").handlers == first.handlers  # Not attached twice
+
+
+def test_records_reach_listener_handlers():
+    log = get_logger("test.delivery")
+    seen = []
+    handler = logging.Handler()
+    handler.emit = seen.append
+    listener = app_logger._listener
+    listener.handlers += (handler,)
+    try:
+        log.warning("hello")
+        listener.queue.join()  # The listener marks each record done after handling it
+    finally:
+        listener.handlers = tuple(h for h in listener.handlers if h is not handler)
+    assert [record.getMessage() for record in seen] == ["hello"]
+
+
+def make_record(msg="failed", level=logging.WARNING, lineno=1):
+    return logging.LogRecord("test", level, "test.py", lineno, msg, None, None)
+
+
+def test_info_is_never_throttled():
+    rate_limit = RateLimitFilter()
+    assert all(rate_limit.filter(make_record(level=logging.INFO)) for _ in range(100))
+
+
+def test_warnings_limited_to_burst_then_summarized():
+    rate_limit = RateLimitFilter()
+    passed = [rate_limit.filter(make_record()) for _ in range(10)]
+    assert passed == [True] * RateLimitFilter.BURST + [False] * (10 - RateLimitFilter.BURST)
+    (summary,) = rate_limit.pending_summaries()
+    assert summary.getMessage().startswith("failed [repeated 7 times")
+    assert rate_limit.pending_summaries() == []
+
+
+def test_call_sites_are_limited_separately():
+    rate_limit = RateLimitFilter()
+    for _ in range(RateLimitFilter.BURST):
+        rate_limit.filter(make_record(lineno=1))
+    assert not rate_limit.filter(make_record(lineno=1))
+    assert rate_limit.filter(make_record(lineno=2))
+
+
+def test_eviction_flushes_pending_summaries():
+    flushed = []
+    rate_limit = RateLimitFilter(sink=flushed.append)
+    rate_limit.MAX_KEYS = 2
+    for _ in range(5):
+        rate_limit.filter(make_record(lineno=1))
+    rate_limit.filter(make_record(lineno=2))
+    assert flushed == []
+    rate_limit.filter(make_record(lineno=3))  # Table full: evicts lines 1 and 2
+    assert [record.getMessage() for record in flushed] == ["failed [repeated 2 times in 0s]"]
@@ -0,0 +1,25 @@
+import pytest
+
+from main import parse_args
+
+
+@pytest.mark.parametrize("text, expected", [("45", 45.0), ("0.2", 1), ("1e7", 600)])
+def test_profile_duration_is_clamped(text, expected):
+    assert parse_args(["--profile", text]).profile == expected
+
+
+@pytest.mark.parametrize("text", ["nan", "inf", "-5", "0", "soon"])
+def test_profile_duration_rejects_bad_values(text):
+    with pytest.raises(SystemExit):
+        parse_args(["--profile", text])
+
+
+def test_bare_profile_means_default():
+    assert parse_args(["--profile"]).profile == 0
+    assert parse_args([]).profile is None
+
+
+def test_control_arguments():
+    args = parse_args(["--color", "#ff0000", "--move", "10", "20", "--unrelated"])
+    assert args.color == "#FF0000"
+    assert args.move == [10, 20]
@@ -0,0 +1,102 @@
+from conftest import PRIMARY, SECONDARY, run_for
+from monitors import FakeMonitorProvider, MonitorTopology
+
+
+class Event:
+    def __init__(self, x_root, y_root):
+        self.x_root = x_root
+        self.y_root = y_root
+
+
+def geometry_xy(window):
+    _, x, y = window.geometry().split("+")
+    return int(x), int(y)
+
+
+def drag(window, clock, to_x, to_y):
+    window.toggle_move_mode()
+    window.start_drag(Event(0, 0))  # Fake winfo_x/y report the origin as (0, 0)
+    window.end_drag(Event(to_x, to_y))
+    window.toggle_move_mode()
+    run_for(clock, 10)
+
+
+def test_topology_lookup():
+    topology = MonitorTopology(FakeMonitorProvider([SECONDARY, PRIMARY]))
+    assert topology.primary() is PRIMARY
+    assert topology.by_name(SECONDARY.name) is SECONDARY
+    assert topology.monitor_for_point(2000, 10) is SECONDARY
+    assert topology.monitor_for_point(-5, 10) is None
+
+
+def test_topology_refresh_is_explicit():
+    provider = FakeMonitorProvider([PRIMARY])
+    topology = MonitorTopology(provider)
+    provider.monitors.append(SECONDARY)
+    assert topology.by_name(SECONDARY.name) is None
+    topology.refresh()
+    assert topology.by_name(SECONDARY.name) is SECONDARY
+
+
+def test_default_position_is_bottom_right_of_primary_work_area(make_window):
+    window = make_window()
+    size = window.size
+    assert geometry_xy(window) == (1920 - size - 8, 1040 - size - 8)
+
+
+def test_drag_stores_monitor_relative_position(make_window, clock):
+    window = make_window()
+    drag(window, clock, 2000, 500)
+    cfg = window.cfg
+    assert (cfg.get("window_x"), cfg.get("window_y")) == (2000, 500)
+    assert cfg.get("window_monitor") == SECONDARY.name
+    assert (cfg.get("window_rel_x"), cfg.get("window_rel_y")) == (80, 500)
+    assert cfg.write_count == 1  # One write for the whole drag
+
+
+def test_drag_motion_applied_once_per_frame(make_window, clock):
+    window = make_window()
+    window.toggle_move_mode()
+    window.start_drag(Event(0, 0))
+    moves = []
+    window.geometry = lambda spec=None: moves.append(spec)
+    for i in range(50):
+        window.on_drag(Event(i, i))
+    assert moves == []  # Motion events only store the target
+    run_for(clock, window.pulse_speed_ms)
+    assert moves == ["+49+49"]
+
+
+def test_position_follows_monitor_when_it_moves(make_window):
+    moved = SECONDARY._replace(rect=(-1920, 0, 0, 1080), work=(-1920, 0, 0, 1080))
+    window = make_window({"window_x": 2000, "window_y": 500, "window_monitor": SECONDARY.name,
+                          "window_rel_x": 80, "window_rel_y": 500}, monitors=(PRIMARY, moved))
+    assert geometry_xy(window) == (-1840, 500)
+
+
+def test_position_clamped_when_monitor_is_gone(make_window):
+    window = make_window({"window_x": 2000, "window_y": 500, "window_monitor": SECONDARY.name,
+                          "window_rel_x": 80, "window_rel_y": 500}, monitors=(PRIMARY,))
+    assert geometry_xy(window) == (1920 - window.size, 500)
+
+
+def test_display_change_re_places_dot(make_window):
+    window = make_window({"window_x": 2000, "window_y": 500, "window_monitor": SECONDARY.name,
+                          "window_rel_x": 80, "window_rel_y": 500}, monitors=(PRIMARY,))
+    window.topology.provider.monitors.append(SECONDARY)
+    window.on_display_changed()
+    assert geometry_xy(window) == (2000, 500)
+
+
+def test_external_absolute_position_overrides_stored_monitor(make_window, clock):
+    window = make_window()
+    drag(window, clock, 2000, 500)
+    # What a hot reload of an edited window_x / window_y delivers
+    with window.cfg.batch():
+        window.cfg.set("window_x", 100)
+        window.cfg.set("window_y", 100)
+    run_for(clock, 10)
+    assert geometry_xy(window) == (100, 100)
+    cfg = window.cfg.snapshot
+    assert cfg.window_monitor == PRIMARY.name
+    assert (cfg.window_rel_x, cfg.window_rel_y) == (100, 100)
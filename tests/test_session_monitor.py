@@ -0,0 +1,22 @@
+from session_monitor import DISPLAY_OFF, FakeSessionMonitor, LOCKED
+
+
+def test_listeners_get_transitions_only():
+    monitor = FakeSessionMonitor()
+    events = []
+    monitor.add_listener(lambda reason, active: events.append((reason, active)))
+    monitor.set_locked(True)
+    monitor.set_locked(True)  # Already locked
+    monitor.set_display_off(True)
+    monitor.set_locked(False)
+    assert events == [(LOCKED, True), (DISPLAY_OFF, True), (LOCKED, False)]
+    assert monitor.inactive_reasons == {DISPLAY_OFF}
+
+
+def test_failing_listener_does_not_block_others():
+    monitor = FakeSessionMonitor()
+    events = []
+    monitor.add_listener(lambda reason, active: 1 / 0)
+    monitor.add_listener(lambda reason, active: events.append(reason))
+    monitor.set_suspended(True)
+    assert events == ["suspended"]
@@ -0,0 +1,61 @@
+import threading
+
+from tray_icon import STATUS_COLORS, FakeTrayController, render_status_frames
+
+
+class FakeIcon:
+    """The pystray.Icon attributes the tray worker touches."""
+
+    def __init__(self):
+        self.visible = False
+        self.title = "RDP Heartbeat"
+        self.assigned = []
+        self._icon = object()  # Plain app icon
+
+    @property
+    def icon(self):
+        return self._icon
+
+    @icon.setter
+    def icon(self, image):
+        self._icon = image
+        self.assigned.append(image)
+
+    def update_menu(self):
+        pass
+
+
+def make_controller(get_health, enabled):
+    noop = lambda: None  # noqa: E731
+    return FakeTrayController(noop, noop, noop, noop, noop, noop, get_health=get_health,
+                              status_interval_ms=100, status_enabled=enabled)
+
+
+def test_one_static_frame_per_status():
+    frames = render_status_frames(size=16)
+    assert frames.keys() == STATUS_COLORS.keys()
+    assert all(frame.size == (16, 16) for frame in frames.values())
+
+
+def test_icon_only_reassigned_when_status_changes():
+    tray = make_controller(None, True)
+    icon = FakeIcon()
+    tray._plain_image = tray._shown_image = icon.icon
+    for status in ("healthy", "healthy", "healthy", "stalled", "stalled", None):
+        tray.update_status(icon, status)
+    assert len(icon.assigned) == 3  # healthy, stalled, back to plain
+    assert icon.title == "RDP Heartbeat"
+
+
+def test_worker_does_not_poll_while_disabled():
+    polled = threading.Event()
+    tray = make_controller(lambda: polled.set() or "healthy", False)
+    icon = FakeIcon()
+    worker = threading.Thread(target=tray.run_worker, args=(icon,), daemon=True)
+    worker.start()
+    assert not polled.wait(0.3)
+    tray.set_status_options(True, 100)
+    assert polled.wait(1.0)
+    tray.stop_worker()
+    worker.join(1.0)
+    assert not worker.is_alive()
@@ -0,0 +1,36 @@
+import pytest
+
+from waveform import CURVES, Waveform, build_table, cycle_ticks
+
+
+@pytest.mark.parametrize("curve", CURVES)
+def test_table_spans_opacity_range(curve):
+    table = build_table(curve, 0.3, 1.0)
+    assert len(table) == cycle_ticks(0.3, 1.0) == 28
+    assert table[0] == 255  # Starts at the brightest frame
+    assert min(table) == round(0.3 * 255)
+
+
+def test_next_wraps_around_the_cycle():
+    waveform = Waveform("triangle", 0.0, 1.0)
+    n = len(waveform.table)
+    values = [waveform.next() for _ in range(n)]
+    assert values[-1] == waveform.table[0]
+    assert values[0] == waveform.table[1]
+
+
+def test_update_rebuilds_only_on_change():
+    waveform = Waveform()
+    table = waveform.table
+    assert not waveform.update("sine", 0.3, 1.0, 50)
+    assert waveform.table is table
+    assert waveform.update("sine", 0.5, 1.0, 50)
+    assert waveform.table is not table
+
+
+def test_advance_wraps_and_skips_dropped_frames():
+    waveform = Waveform("triangle", 0.0, 1.0)
+    n = len(waveform.table)
+    assert waveform.advance(1) == waveform.table[1]
+    assert waveform.advance(n) == waveform.table[1]  # A full cycle lands on the same frame
+    assert waveform.advance(3) == waveform.table[4]
@@ -0,0 +1,48 @@
+from win_utils import FakeBackend, WS_EX_LAYERED, WS_EX_TRANSPARENT, parse_color_key
+
+
+def test_click_through_toggles_transparent_but_keeps_layered():
+    backend = FakeBackend()
+    backend.set_click_through(1)
+    assert backend.ex_styles[1] == WS_EX_LAYERED | WS_EX_TRANSPARENT
+    backend.remove_click_through(1)
+    assert backend.ex_styles[1] == WS_EX_LAYERED
+
+
+def test_layered_alpha_stored_per_window():
+    backend = FakeBackend()
+    backend.set_layered_alpha(1, "#000001", 200)
+    backend.set_layered_alpha(2, "#000001", 50)
+    assert backend.layered[1] == (parse_color_key("#000001"), 200)
+    assert backend.layered[2][1] == 50
+
+
+def test_calls_not_recorded_by_default():
+    backend = FakeBackend()
+    for _ in range(100):
+        backend.set_layered_alpha(1, "#000001", 10)
+    assert backend.calls == []
+    assert backend.total_calls() == 100
+
+
+def test_calls_recorded_on_request():
+    backend = FakeBackend(record_calls=True)
+    backend.set_click_through(7)
+    backend.set_layered_alpha(7, "#000001", 128)
+    assert backend.calls == [("set_click_through", 7), ("set_layered_alpha", 7, 128)]
+
+
+def test_stats_count_per_function():
+    backend = FakeBackend()
+    backend.find_window_by_title("x")
+    backend.find_window_by_title("y")
+    backend.set_click_through(1)
+    stats = backend.stats()
+    assert stats["find_window_by_title"][0] == 2
+    assert stats["set_click_through"][0] == 1
+    backend.reset_stats()
+    assert backend.total_calls() == 0
+
+
+def test_parse_color_key_is_bgr():
+    assert parse_color_key("#112233") == 0x332211
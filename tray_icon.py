@@ -1,7 +1,7 @@
-from pystray import Icon, Menu, MenuItem
-from PIL import Image, ImageDraw
 import os
 import sys
+import threading
+import time
 from logger import get_logger
 from i18n import t
 
@@ -18,6 +18,8 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 def create_icon():
+    from PIL import Image, ImageDraw
+
     # 1. Try loading from file (icon.ico)
     try:
         icon_path = resource_path("icon.ico")
@@ -40,33 +42,159 @@ def create_icon():
 
     return image
 
+# Status icon colors (keys match heartbeat_window.HEALTHY / LAGGING / STALLED)
+STATUS_COLORS = {
+    "healthy": "#00FFFF",
+    "lagging": "#FFB000",
+    "stalled": "#FF3030",
+}
+
+# Tray icons are 16 px at 100% scaling and 32 px at 200%; render once at the
+# larger size and let the shell scale down
+STATUS_ICON_SIZE = 32
+
+def render_status_frames(size=STATUS_ICON_SIZE):
+    """
+    Pre-renders one static frame per status: {status: image}. The icon only
+    changes when the status does, since every change makes pystray
+    re-encode an icon for the shell.
+    """
+    from PIL import Image
+    from dot_renderer import parse_hex_color, render_coverage_mask
+
+    mask = render_coverage_mask(size)
+    frames = {}
+    for status, color in STATUS_COLORS.items():
+        image = Image.new("RGBA", (size, size), parse_hex_color(color) + (0,))
+        image.putalpha(mask)
+        frames[status] = image
+    return frames
+
 class TrayController:
-    def __init__(self, on_show, on_hide, on_move, on_settings, on_about, on_exit):
+    def __init__(self, on_show, on_hide, on_move, on_settings, on_about, on_exit, get_frame_stats=None,
+                 icon_image=None, get_health=None, status_interval_ms=1000, on_profile=None,
+                 status_enabled=False):
         self.on_show = on_show
         self.on_hide = on_hide
         self.on_move = on_move
         self.on_settings = on_settings
         self.on_about = on_about
         self.on_exit = on_exit
+        self.on_profile = on_profile
+        self.get_frame_stats = get_frame_stats  # Returns a one-line timing summary
+        self.icon_image = icon_image  # Preloaded image, decoded off the startup path
         self.icon = None
-        self.is_moving = False
+        self.is_moving = False  # Written only via set_moving() from the Tk thread
+        # Status icon: get_health() returns a STATUS_COLORS key, or None for the plain icon
+        self.get_health = get_health
+        self.status_enabled = status_enabled
+        self.status_interval_s = max(status_interval_ms, 100) / 1000
+        self._next_status = 0.0
+        self._status_frames = None
+        self._status = None
+        self._plain_image = None
+        self._shown_image = None
+        # Other threads never touch the pystray icon; they set a flag and
+        # wake the worker on pystray's setup thread
+        self._wake = threading.Event()
+        self._menu_dirty = False
+        self._stopping = False
 
     def run(self):
+        from pystray import Icon, Menu, MenuItem
+
         menu = Menu(
             MenuItem(lambda item: t("tray.show"), self.on_show_clicked),
             MenuItem(lambda item: t("tray.hide"), self.on_hide_clicked),
             MenuItem(self.get_move_label, self.on_move_clicked),
             MenuItem(lambda item: t("tray.settings"), self.on_settings_clicked),
             MenuItem(lambda item: t("tray.about"), self.on_about_clicked),
+            Menu.SEPARATOR,
+            MenuItem(lambda item: t("tray.profile"), self.on_profile_clicked,
+                     visible=lambda item: self.on_profile is not None),
+            MenuItem(self.get_frame_stats_label, None, enabled=False,
+                     visible=lambda item: self.get_frame_stats is not None),
             MenuItem(lambda item: t("tray.exit"), self.on_exit_clicked)
         )
 
-        self.icon = Icon("RDP Heartbeat", create_icon(), "RDP Heartbeat", menu)
-        self.icon.run()
+        self.icon = Icon("RDP Heartbeat", self.icon_image or create_icon(), "RDP Heartbeat", menu)
+        self.icon.run(setup=self.run_worker)
+
+    def set_moving(self, moving):
+        """Called by the window when move mode changes."""
+        self.is_moving = moving
+        self.request_menu_update()
+
+    def set_status_options(self, enabled, interval_ms):
+        """Thread-safe: turns the status icon on or off and sets its refresh rate."""
+        self.status_enabled = enabled
+        self.status_interval_s = max(interval_ms, 100) / 1000
+        self._next_status = 0.0  # Apply at once
+        self._wake.set()
+
+    def request_menu_update(self):
+        """Thread-safe: the menu is rebuilt on the worker thread."""
+        self._menu_dirty = True
+        self._wake.set()
+
+    def stop_worker(self):
+        self._stopping = True
+        self._wake.set()
+
+    def run_worker(self, icon):
+        """
+        Runs on pystray's setup thread: applies menu refreshes requested by
+        other threads and, if enabled, the status icon. Health is polled at
+        most once per status_interval_s and the icon is only swapped when the
+        status changes. While the status icon is off the thread sleeps until
+        woken, with no periodic wakeups.
+        """
+        icon.visible = True
+        self._plain_image = self._shown_image = icon.icon
+        while True:
+            enabled = self.status_enabled and self.get_health is not None
+            self._wake.wait(self.status_interval_s if enabled else None)
+            self._wake.clear()
+            if self._stopping:
+                return
+            try:
+                if self._menu_dirty:
+                    self._menu_dirty = False
+                    icon.update_menu()
+                if not (self.status_enabled and self.get_health is not None):
+                    if self._status is not None:
+                        self.update_status(icon, None)  # Back to the plain icon
+                elif time.monotonic() >= self._next_status:
+                    self._next_status = time.monotonic() + self.status_interval_s
+                    self.update_status(icon, self.get_health())
+            except Exception as e:
+                logger.error(f"Error in tray worker: {e}")
+
+    def update_status(self, icon, status):
+        last_status = self._status
+        self._status = status
+        if status is None:
+            frame = self._plain_image
+        else:
+            if self._status_frames is None:
+                self._status_frames = render_status_frames()
+            frame = self._status_frames[status]
+        if frame is not self._shown_image:
+            icon.icon = frame
+            self._shown_image = frame
+        if status != last_status:
+            icon.title = f"RDP Heartbeat - {t('tray.status.' + status)}" if status else "RDP Heartbeat"
 
     def get_move_label(self, item):
         return t("tray.move_disable") if self.is_moving else t("tray.move_enable")
 
+    def get_frame_stats_label(self, item):
+        try:
+            stats = self.get_frame_stats() if self.get_frame_stats else ""
+        except Exception:
+            stats = "?"
+        return t("tray.frame_timing").format(stats=stats)
+
     def on_show_clicked(self, icon, item):
         if self.on_show:
             self.on_show()
@@ -76,7 +204,7 @@ class TrayController:
             self.on_hide()
 
     def on_move_clicked(self, icon, item):
-        self.is_moving = not self.is_moving
+        # is_moving follows the window's state via set_moving()
         if self.on_move:
             self.on_move()
 
@@ -88,13 +216,38 @@ class TrayController:
         if self.on_about:
             self.on_about()
 
+    def on_profile_clicked(self, icon, item):
+        if self.on_profile:
+            self.on_profile()
+
     def on_exit_clicked(self, icon, item):
+        self.stop_worker()
         icon.stop()
         if self.on_exit:
             self.on_exit()
 
-def start_tray(on_show, on_hide, on_move, on_settings, on_about, on_exit):
+class FakeTrayController(TrayController):
+    """
+    Stand-in with no system tray, for benchmarks and headless runs.
+    run() blocks like pystray's until stop() is called.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stopped = threading.Event()
+
+    def run(self):
+        self._stopped.wait()
+
+    def stop(self):
+        self.stop_worker()
+        self._stopped.set()
+
+def start_tray(on_show, on_hide, on_move, on_settings, on_about, on_exit, get_frame_stats=None, icon_image=None,
+               get_health=None, status_interval_ms=1000, on_profile=None, status_enabled=False, fake=False):
     """
-    Starts the tray icon controller.
+    Starts the tray icon controller. fake=True returns a FakeTrayController.
     """
-    return TrayController(on_show, on_hide, on_move, on_settings, on_about, on_exit)
+    cls = FakeTrayController if fake else TrayController
+    return cls(on_show, on_hide, on_move, on_settings, on_about, on_exit, get_frame_stats, icon_image,
+               get_health, status_interval_ms, on_profile, status_enabled)
@@ -0,0 +1,102 @@
+import math
+from array import array
+
+# Alpha change per tick of the original linear pulse. The cycle length in
+# ticks is derived from it so the default rhythm stays the same.
+ALPHA_STEP = 0.05
+
+CURVES = ("sine", "ease_in_out", "triangle")
+DEFAULT_CURVE = "sine"
+
+
+def _triangle(phase):
+    """1.0 at phase 0, 0.0 at phase 0.5, back to 1.0 at phase 1."""
+    return abs(1.0 - 2.0 * phase)
+
+
+def _sine(phase):
+    return (1.0 + math.cos(2.0 * math.pi * phase)) / 2.0
+
+
+def _ease_in_out(phase):
+    s = _triangle(phase)
+    return s * s * (3.0 - 2.0 * s)
+
+
+_CURVE_FUNCS = {
+    "sine": _sine,
+    "ease_in_out": _ease_in_out,
+    "triangle": _triangle,
+}
+
+
+def cycle_ticks(opacity_min, opacity_max):
+    """Number of ticks in one full breath (max -> min -> max)."""
+    span = abs(opacity_max - opacity_min)
+    return max(2, int(round(2 * span / ALPHA_STEP)))
+
+
+def build_table(curve, opacity_min, opacity_max):
+    """
+    Precomputes one breathing cycle as alpha bytes (0-255).
+    Index 0 is the brightest frame, the cycle fades out first like the old pulse.
+    """
+    func = _CURVE_FUNCS.get(curve, _CURVE_FUNCS[DEFAULT_CURVE])
+    lo = max(0.0, min(1.0, float(opacity_min)))
+    hi = max(0.0, min(1.0, float(opacity_max)))
+    n = cycle_ticks(lo, hi)
+    table = array('B')
+    for i in range(n):
+        level = func(i / n)
+        value = int(round((lo + (hi - lo) * level) * 255))
+        table.append(max(0, min(255, value)))
+    return table
+
+
+class Waveform:
+    """
+    One precomputed breathing cycle. The table is rebuilt only when the
+    parameters passed to update() differ from the ones it was built with,
+    so advancing a frame is an index increment and a byte lookup.
+    """
+
+    def __init__(self, curve=DEFAULT_CURVE, opacity_min=0.3, opacity_max=1.0, pulse_speed_ms=50):
+        self._key = None
+        self.table = array('B')
+        self.index = 0
+        self.update(curve, opacity_min, opacity_max, pulse_speed_ms)
+
+    def update(self, curve, opacity_min, opacity_max, pulse_speed_ms):
+        """Rebuilds the table if any parameter changed. Returns True if rebuilt."""
+        key = (curve, opacity_min, opacity_max, pulse_speed_ms)
+        if key == self._key:
+            return False
+        self._key = key
+        self.table = build_table(curve, opacity_min, opacity_max)
+        self.pulse_speed_ms = pulse_speed_ms
+        # Keep the current position in the cycle roughly stable across rebuilds
+        if self.index >= len(self.table):
+            self.index = 0
+        return True
+
+    def next(self):
+        """Advances one tick and returns the alpha byte for it."""
+        i = self.index + 1
+        if i >= len(self.table):
+            i = 0
+        self.index = i
+        return self.table[i]
+
+    def advance(self, frames):
+        """Advances `frames` ticks at once (used when frames were dropped)."""
+        if frames == 1:
+            return self.next()
+        self.index = (self.index + frames) % len(self.table)
+        return self.table[self.index]
+
+    def current(self):
+        return self.table[self.index]
+
+    @property
+    def cycle_ms(self):
+        return len(self.table) * self.pulse_speed_ms
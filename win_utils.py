@@ -1,5 +1,6 @@
 import ctypes
 import platform
+import time
 from ctypes import wintypes
 from logger import get_logger
 
@@ -12,49 +13,362 @@ WS_EX_TRANSPARENT = 0x00000020
 SPI_GETWORKAREA = 0x0030
 LWA_COLORKEY = 0x00000001
 LWA_ALPHA = 0x00000002
+ULW_ALPHA = 0x00000002
+AC_SRC_OVER = 0x00
+AC_SRC_ALPHA = 0x01
+BI_RGB = 0
+DIB_RGB_COLORS = 0
+
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [("biSize", wintypes.DWORD), ("biWidth", wintypes.LONG), ("biHeight", wintypes.LONG),
+                ("biPlanes", wintypes.WORD), ("biBitCount", wintypes.WORD), ("biCompression", wintypes.DWORD),
+                ("biSizeImage", wintypes.DWORD), ("biXPelsPerMeter", wintypes.LONG),
+                ("biYPelsPerMeter", wintypes.LONG), ("biClrUsed", wintypes.DWORD),
+                ("biClrImportant", wintypes.DWORD)]
+
+
+class BLENDFUNCTION(ctypes.Structure):
+    _fields_ = [("BlendOp", ctypes.c_ubyte), ("BlendFlags", ctypes.c_ubyte),
+                ("SourceConstantAlpha", ctypes.c_ubyte), ("AlphaFormat", ctypes.c_ubyte)]
+
+
+class LayeredSurface:
+    """
+    A frame atlas uploaded once into a DIB section selected into a memory DC.
+    The SIZE/POINT/BLENDFUNCTION arguments are built here so presenting a
+    frame only rewrites the source row.
+    """
+
+    def __init__(self, hdc, hbitmap, old_bitmap, width, frame_height):
+        self.hdc = hdc
+        self.hbitmap = hbitmap
+        self.old_bitmap = old_bitmap
+        self.size = wintypes.SIZE(width, frame_height)
+        self.src = wintypes.POINT(0, 0)
+        self.blend = BLENDFUNCTION(AC_SRC_OVER, 0, 255, AC_SRC_ALPHA)
+        self.frame_height = frame_height
+
+
+class _BackendStats:
+    """Per-function call counters and cumulative time, shared by all backends."""
+
+    def __init__(self):
+        self.call_counts = {}
+        self.call_time_ns = {}
+
+    def _record(self, name, start_ns):
+        self.call_counts[name] = self.call_counts.get(name, 0) + 1
+        self.call_time_ns[name] = self.call_time_ns.get(name, 0) + time.perf_counter_ns() - start_ns
+
+    def stats(self):
+        """Returns {function_name: (calls, total_ms)}."""
+        return {name: (count, self.call_time_ns.get(name, 0) / 1e6)
+                for name, count in self.call_counts.items()}
+
+    def reset_stats(self):
+        self.call_counts.clear()
+        self.call_time_ns.clear()
+
+    def total_calls(self):
+        return sum(self.call_counts.values())
+
+
+def parse_color_key(color_key_hex):
+    """Converts "#RRGGBB" to a COLORREF (0x00BBGGRR)."""
+    r = int(color_key_hex[1:3], 16)
+    g = int(color_key_hex[3:5], 16)
+    b = int(color_key_hex[5:7], 16)
+    return (b << 16) | (g << 8) | r
+
+
+class Win32Backend(_BackendStats):
+    """
+    user32 window helpers with prototypes resolved once at construction.
+    Uses a private WinDLL so argtypes don't leak into ctypes.windll.user32.
+    """
+
+    def __init__(self):
+        super().__init__()
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+        self._GetWindowLongW = user32.GetWindowLongW
+        self._GetWindowLongW.argtypes = (wintypes.HWND, ctypes.c_int)
+        self._GetWindowLongW.restype = wintypes.LONG
+
+        self._SetWindowLongW = user32.SetWindowLongW
+        self._SetWindowLongW.argtypes = (wintypes.HWND, ctypes.c_int, wintypes.LONG)
+        self._SetWindowLongW.restype = wintypes.LONG
+
+        self._SetLayeredWindowAttributes = user32.SetLayeredWindowAttributes
+        self._SetLayeredWindowAttributes.argtypes = (wintypes.HWND, wintypes.DWORD, ctypes.c_ubyte, wintypes.DWORD)
+        self._SetLayeredWindowAttributes.restype = wintypes.BOOL
+
+        self._FindWindowW = user32.FindWindowW
+        self._FindWindowW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR)
+        self._FindWindowW.restype = wintypes.HWND
+
+        self._SystemParametersInfoW = user32.SystemParametersInfoW
+        self._SystemParametersInfoW.argtypes = (wintypes.UINT, wintypes.UINT, ctypes.c_void_p, wintypes.UINT)
+        self._SystemParametersInfoW.restype = wintypes.BOOL
+
+        self._UpdateLayeredWindow = user32.UpdateLayeredWindow
+        self._UpdateLayeredWindow.argtypes = (wintypes.HWND, wintypes.HDC, ctypes.POINTER(wintypes.POINT),
+                                              ctypes.POINTER(wintypes.SIZE), wintypes.HDC,
+                                              ctypes.POINTER(wintypes.POINT), wintypes.DWORD,
+                                              ctypes.POINTER(BLENDFUNCTION), wintypes.DWORD)
+        self._UpdateLayeredWindow.restype = wintypes.BOOL
+
+        self._GetDC = user32.GetDC
+        self._GetDC.argtypes = (wintypes.HWND,)
+        self._GetDC.restype = wintypes.HDC
+
+        self._ReleaseDC = user32.ReleaseDC
+        self._ReleaseDC.argtypes = (wintypes.HWND, wintypes.HDC)
+        self._ReleaseDC.restype = ctypes.c_int
+
+        gdi32 = ctypes.WinDLL("gdi32", use_last_error=True)
+
+        self._CreateCompatibleDC = gdi32.CreateCompatibleDC
+        self._CreateCompatibleDC.argtypes = (wintypes.HDC,)
+        self._CreateCompatibleDC.restype = wintypes.HDC
+
+        self._CreateDIBSection = gdi32.CreateDIBSection
+        self._CreateDIBSection.argtypes = (wintypes.HDC, ctypes.POINTER(BITMAPINFOHEADER), wintypes.UINT,
+                                           ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD)
+        self._CreateDIBSection.restype = wintypes.HBITMAP
+
+        self._SelectObject = gdi32.SelectObject
+        self._SelectObject.argtypes = (wintypes.HDC, wintypes.HGDIOBJ)
+        self._SelectObject.restype = wintypes.HGDIOBJ
+
+        self._DeleteObject = gdi32.DeleteObject
+        self._DeleteObject.argtypes = (wintypes.HGDIOBJ,)
+        self._DeleteObject.restype = wintypes.BOOL
+
+        self._DeleteDC = gdi32.DeleteDC
+        self._DeleteDC.argtypes = (wintypes.HDC,)
+        self._DeleteDC.restype = wintypes.BOOL
+
+        # Single-entry cache: the color key practically never changes
+        self._color_key_hex = None
+        self._color_key = 0
+
+    def _colorref(self, color_key_hex):
+        if color_key_hex != self._color_key_hex:
+            self._color_key = parse_color_key(color_key_hex)
+            self._color_key_hex = color_key_hex
+        return self._color_key
+
+    def set_click_through(self, hwnd):
+        start = time.perf_counter_ns()
+        try:
+            ex_style = self._GetWindowLongW(hwnd, GWL_EXSTYLE)
+            self._SetWindowLongW(hwnd, GWL_EXSTYLE, ex_style | WS_EX_LAYERED | WS_EX_TRANSPARENT)
+        except Exception as e:
+            logger.error(f"Failed to set click-through: {e}")
+        self._record("set_click_through", start)
+
+    def remove_click_through(self, hwnd):
+        start = time.perf_counter_ns()
+        try:
+            ex_style = self._GetWindowLongW(hwnd, GWL_EXSTYLE)
+            # Remove WS_EX_TRANSPARENT, keep others
+            self._SetWindowLongW(hwnd, GWL_EXSTYLE, ex_style & ~WS_EX_TRANSPARENT)
+        except Exception as e:
+            logger.error(f"Failed to remove click-through: {e}")
+        self._record("remove_click_through", start)
+
+    def find_window_by_title(self, title):
+        start = time.perf_counter_ns()
+        try:
+            return self._FindWindowW(None, title) or 0
+        except Exception as e:
+            logger.error(f"Failed to find window: {e}")
+            return 0
+        finally:
+            self._record("find_window_by_title", start)
+
+    def set_layered_alpha(self, hwnd, color_key_hex, alpha_byte):
+        start = time.perf_counter_ns()
+        try:
+            self._SetLayeredWindowAttributes(hwnd, self._colorref(color_key_hex), alpha_byte,
+                                             LWA_COLORKEY | LWA_ALPHA)
+        except Exception as e:
+            logger.error(f"Failed to set layered attributes: {e}")
+        self._record("set_layered_alpha", start)
+
+    def get_work_area(self):
+        start = time.perf_counter_ns()
+        try:
+            rect = wintypes.RECT()
+            self._SystemParametersInfoW(SPI_GETWORKAREA, 0, ctypes.byref(rect), 0)
+            return (rect.left, rect.top, rect.right, rect.bottom)
+        finally:
+            self._record("get_work_area", start)
+
+    def create_layered_surface(self, atlas):
+        """Uploads a dot_renderer.DotAtlas into a GDI surface for present_layered_frame()."""
+        start = time.perf_counter_ns()
+        hdc_screen = self._GetDC(None)
+        try:
+            hdc = self._CreateCompatibleDC(hdc_screen)
+            bmi = BITMAPINFOHEADER()
+            bmi.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+            bmi.biWidth = atlas.size
+            bmi.biHeight = -atlas.size * atlas.frame_count  # Negative: top-down rows
+            bmi.biPlanes = 1
+            bmi.biBitCount = 32
+            bmi.biCompression = BI_RGB
+            bits = ctypes.c_void_p()
+            hbitmap = self._CreateDIBSection(hdc, ctypes.byref(bmi), DIB_RGB_COLORS, ctypes.byref(bits), None, 0)
+            if not hbitmap:
+                self._DeleteDC(hdc)
+                raise ctypes.WinError(ctypes.get_last_error())
+            ctypes.memmove(bits, atlas.pixels, len(atlas.pixels))
+            old_bitmap = self._SelectObject(hdc, hbitmap)
+            return LayeredSurface(hdc, hbitmap, old_bitmap, atlas.size, atlas.size)
+        finally:
+            self._ReleaseDC(None, hdc_screen)
+            self._record("create_layered_surface", start)
+
+    def present_layered_frame(self, hwnd, surface, row):
+        """Shows atlas frame `row` on a per-pixel-alpha layered window via UpdateLayeredWindow."""
+        start = time.perf_counter_ns()
+        try:
+            surface.src.y = row * surface.frame_height
+            if not self._UpdateLayeredWindow(hwnd, None, None, ctypes.byref(surface.size), surface.hdc,
+                                             ctypes.byref(surface.src), 0, ctypes.byref(surface.blend),
+                                             ULW_ALPHA):
+                raise ctypes.WinError(ctypes.get_last_error())
+        except Exception as e:
+            logger.error(f"Failed to update layered window: {e}")
+        self._record("present_layered_frame", start)
+
+    def free_layered_surface(self, surface):
+        start = time.perf_counter_ns()
+        try:
+            self._SelectObject(surface.hdc, surface.old_bitmap)
+            self._DeleteObject(surface.hbitmap)
+            self._DeleteDC(surface.hdc)
+        except Exception as e:
+            logger.error(f"Failed to free layered surface: {e}")
+        self._record("free_layered_surface", start)
+
+
+class FakeBackend(_BackendStats):
+    """
+    In-memory stand-in for Win32Backend, used on non-Windows platforms and in
+    benchmarks. Tracks window styles and layered attributes per hwnd. With
+    record_calls=True it also appends every call, in order, to `calls`;
+    that list grows with every frame, so it is off unless a test asks.
+    """
+
+    def __init__(self, work_area=None, record_calls=False):
+        super().__init__()
+        self.work_area = work_area
+        self.record_calls = record_calls
+        self.calls = []
+        self.ex_styles = {}
+        self.layered = {}  # hwnd -> (colorref, alpha_byte), or (None, atlas_row) for per-pixel frames
+        self.windows = {}  # title -> hwnd
+
+    def _log(self, name, *args):
+        if self.record_calls:
+            self.calls.append((name,) + args)
+
+    def set_click_through(self, hwnd):
+        start = time.perf_counter_ns()
+        self._log("set_click_through", hwnd)
+        self.ex_styles[hwnd] = self.ex_styles.get(hwnd, 0) | WS_EX_LAYERED | WS_EX_TRANSPARENT
+        self._record("set_click_through", start)
+
+    def remove_click_through(self, hwnd):
+        start = time.perf_counter_ns()
+        self._log("remove_click_through", hwnd)
+        self.ex_styles[hwnd] = self.ex_styles.get(hwnd, 0) & ~WS_EX_TRANSPARENT
+        self._record("remove_click_through", start)
+
+    def find_window_by_title(self, title):
+        start = time.perf_counter_ns()
+        self._log("find_window_by_title", title)
+        hwnd = self.windows.get(title, 0)
+        self._record("find_window_by_title", start)
+        return hwnd
+
+    def set_layered_alpha(self, hwnd, color_key_hex, alpha_byte):
+        start = time.perf_counter_ns()
+        self._log("set_layered_alpha", hwnd, alpha_byte)
+        self.layered[hwnd] = (parse_color_key(color_key_hex), alpha_byte)
+        self._record("set_layered_alpha", start)
+
+    def get_work_area(self):
+        start = time.perf_counter_ns()
+        self._log("get_work_area")
+        self._record("get_work_area", start)
+        if self.work_area is None:
+            # Callers fall back to Tk's screen size
+            raise OSError("No work area available")
+        return self.work_area
+
+    def create_layered_surface(self, atlas):
+        start = time.perf_counter_ns()
+        self._log("create_layered_surface", atlas.color, atlas.size, atlas.frame_count)
+        surface = LayeredSurface(None, atlas, None, atlas.size, atlas.size)
+        self._record("create_layered_surface", start)
+        return surface
+
+    def present_layered_frame(self, hwnd, surface, row):
+        start = time.perf_counter_ns()
+        self._log("present_layered_frame", hwnd, row)
+        surface.src.y = row * surface.frame_height
+        self.layered[hwnd] = (None, row)
+        self._record("present_layered_frame", start)
+
+    def free_layered_surface(self, surface):
+        start = time.perf_counter_ns()
+        self._log("free_layered_surface")
+        self._record("free_layered_surface", start)
+
+
+_backend = None
+
+def get_backend():
+    """Returns the process-wide backend, creating the platform default on first use."""
+    global _backend
+    if _backend is None:
+        if platform.system() == "Windows":
+            _backend = Win32Backend()
+        else:
+            _backend = FakeBackend()
+    return _backend
+
+def set_backend(backend):
+    """Replaces the process-wide backend (tests and benchmarks)."""
+    global _backend
+    _backend = backend
+
+
+# ── Module-level helpers (delegate to the current backend) ──
 
 def set_click_through(hwnd):
     """
     Makes the window transparent to mouse events (click-through).
     Requires the window to be a layered window.
     """
-    if platform.system() != "Windows":
-        return
-
-    try:
-        user32 = ctypes.windll.user32
-        ex_style = user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
-        user32.SetWindowLongW(hwnd, GWL_EXSTYLE, ex_style | WS_EX_LAYERED | WS_EX_TRANSPARENT)
-    except Exception as e:
-        logger.error(f"Failed to set click-through: {e}")
+    get_backend().set_click_through(hwnd)
 
 def remove_click_through(hwnd):
     """
     Removes the click-through style (WS_EX_TRANSPARENT) but keeps WS_EX_LAYERED.
     """
-    if platform.system() != "Windows":
-        return
-
-    try:
-        user32 = ctypes.windll.user32
-        ex_style = user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
-        # Remove WS_EX_TRANSPARENT, keep others
-        new_style = ex_style & ~WS_EX_TRANSPARENT
-        user32.SetWindowLongW(hwnd, GWL_EXSTYLE, new_style)
-    except Exception as e:
-        logger.error(f"Failed to remove click-through: {e}")
+    get_backend().remove_click_through(hwnd)
 
 def find_window_by_title(title):
     """
     Finds a window by its title. Returns 0 if not found.
     """
-    if platform.system() != "Windows":
-        return 0
-    try:
-        return ctypes.windll.user32.FindWindowW(None, title)
-    except Exception as e:
-        logger.error(f"Failed to find window: {e}")
-        return 0
+    return get_backend().find_window_by_title(title)
 
 def set_layered_attributes(hwnd, color_key_hex, alpha_float):
     """
@@ -64,25 +378,21 @@ def set_layered_attributes(hwnd, color_key_hex, alpha_float):
     color_key_hex: string like "#000001"
     alpha_float: 0.0 to 1.0
     """
-    if platform.system() != "Windows":
-        return
-
-    try:
-        # Convert hex string to COLORREF (0x00BBGGRR)
-        # hex is "#RRGGBB"
-        r = int(color_key_hex[1:3], 16)
-        g = int(color_key_hex[3:5], 16)
-        b = int(color_key_hex[5:7], 16)
-        crKey = (b << 16) | (g << 8) | r
-
-        bAlpha = int(alpha_float * 255)
+    set_layered_alpha(hwnd, color_key_hex, max(0, min(255, int(alpha_float * 255))))
 
-        # Ensure values are within byte range
-        bAlpha = max(0, min(255, bAlpha))
+def set_layered_alpha(hwnd, color_key_hex, alpha_byte):
+    """
+    Same as set_layered_attributes, but takes the alpha as a byte (0-255)
+    so precomputed waveform values can be passed through unchanged.
+    """
+    get_backend().set_layered_alpha(hwnd, color_key_hex, alpha_byte)
 
-        ctypes.windll.user32.SetLayeredWindowAttributes(hwnd, crKey, bAlpha, LWA_COLORKEY | LWA_ALPHA)
-    except Exception as e:
-        logger.error(f"Failed to set layered attributes: {e}")
+def get_work_area():
+    """
+    Returns the (left, top, right, bottom) of the screen work area
+    (excluding taskbar and docked bars).
+    """
+    return get_backend().get_work_area()
 
 def set_dpi_awareness():
     """Sets the process to be DPI aware."""
@@ -96,19 +406,29 @@ def set_dpi_awareness():
         except:
             pass
 
-def get_work_area():
+def begin_timer_resolution(period_ms=1):
     """
-    Returns the (left, top, right, bottom) of the screen work area
-    (excluding taskbar and docked bars).
+    Requests a finer system timer resolution (timeBeginPeriod) so short
+    after() delays fire closer to their deadline. Returns True if granted;
+    every successful call must be paired with end_timer_resolution().
     """
     if platform.system() != "Windows":
-        # Fallback for non-Windows
-        user32 = ctypes.windll.user32
-        return (0, 0, user32.GetSystemMetrics(0), user32.GetSystemMetrics(1))
+        return False
+    try:
+        TIMERR_NOERROR = 0
+        return ctypes.windll.winmm.timeBeginPeriod(period_ms) == TIMERR_NOERROR
+    except Exception as e:
+        logger.warning(f"Failed to raise timer resolution: {e}")
+        return False
 
-    rect = wintypes.RECT()
-    ctypes.windll.user32.SystemParametersInfoW(SPI_GETWORKAREA, 0, ctypes.byref(rect), 0)
-    return (rect.left, rect.top, rect.right, rect.bottom)
+def end_timer_resolution(period_ms=1):
+    """Releases a resolution request made with begin_timer_resolution()."""
+    if platform.system() != "Windows":
+        return
+    try:
+        ctypes.windll.winmm.timeEndPeriod(period_ms)
+    except Exception as e:
+        logger.warning(f"Failed to restore timer resolution: {e}")
 
 def create_single_instance_mutex(name):
     """
@@ -135,3 +455,13 @@ def create_single_instance_mutex(name):
 def release_mutex(handle):
     if handle and platform.system() == "Windows":
         ctypes.windll.kernel32.CloseHandle(handle)
+
+def get_session_id():
+    """Terminal Services session of this process (0 off Windows or on failure)."""
+    if platform.system() != "Windows":
+        return 0
+    session_id = wintypes.DWORD()
+    kernel32 = ctypes.windll.kernel32
+    if kernel32.ProcessIdToSessionId(kernel32.GetCurrentProcessId(), ctypes.byref(session_id)):
+        return session_id.value
+    return 0